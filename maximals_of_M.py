@@ -34,12 +34,20 @@ import multiprocessing as mp
 
 
 # A function to calculate the group commutator $[a,b] = a^{-1}b^{-1}ab$.
+# 
+# This function, like the other general helper functions below (elt_to_24_mat, get_random, trace_mod_3, ...), is defined in the module mtools/helpers.py, so that other scripts can import it without running this notebook. The import is cheap, since mmgroup, NumPy and multiprocessing are only imported by the helpers that need them; import_time() measures it in a fresh interpreter, and it should take less than IMPORT_BUDGET seconds.
 
 # In[2]:
 
 
-def Comm(a,b):
-   return a**(-1)*b**(-1)*a*b
+from mtools.helpers import Comm
+
+
+# In[ ]:
+
+
+from mtools.helpers import import_time, IMPORT_BUDGET
+import_time() < IMPORT_BUDGET
 
 
 # ## Code accompanying Section 2
@@ -60,7 +68,11 @@ b = MM("M<y_32bh*x_0e4h*d_30fh*p_81928987*l_2*p_2880*l_1*p_21312*l_1*p_10455360>
 # In[4]:
 
 
-def verify_std_gens_G(a,b):
+from mtools.checkpoint import Checkpoint
+from mtools.commuting import commute_matrix
+from mtools.gx0 import GElt
+
+def verify_std_gens_G(a,b,resume=None):
    # the central element in mmgroup's copy of G = 2^{1+24}.Co_1
    z = MM("M<x_1000h>")
    if not (Comm(a**2,b**3) == z and a*z == z*a and b*z == z*b):
@@ -83,35 +95,56 @@ def verify_std_gens_G(a,b):
    # check that we can generate Q: construct j0,..,j23
    myels = [(a**2)**((a*b)**i) for i in range(0,24)]
    # elements need to lie in Q, commute modulo the centre, and have order 2
+   commuting = commute_matrix(myels)
    for i in range(0,24):
        if not myels[i].in_Q_x0():
            return False
        for j in range(i+1,24):
-           if (myels[i]*myels[j] != myels[j]*myels[i]) and Comm(myels[i],myels[j]) != z:
+           if not commuting[i,j] and Comm(myels[i],myels[j]) != z:
                return False
            if myels[i].order() != 2:
                return False
    print("all good so far; now check size of Q;")
    print("this will take a long time")
    # check that ((myels[0]**i0)* ... *(myels[23]**i23)).order() == 1 mod <z> only for i0==...==i23=0
-   s=0
-   tups = it.product([0,1], repeat=24)
-   for t in tups:
-       if np.sum(t)==0:
-           continue
+   # the tuples (i0,...,i23) are enumerated as the Gray codes k^(k>>1) of 1,...,2^24-1, so that
+   # consecutive tuples differ in one entry i; as the elements of myels have order 2 and commute
+   # modulo z, the next product (modulo z) is the previous one times myels[i]; the products are
+   # computed in G_x0 (see mtools/gx0.py); if resume is a file name, the position in this
+   # enumeration is saved there regularly, and resumed from it
+   checkpoint, first = None, 1
+   if resume is not None:
+       checkpoint = Checkpoint(resume, (a.as_tuples(), b.as_tuples()))
+       first = checkpoint.load() or 1
+   myels_G = [GElt(x) for x in myels]
+   z_G = GElt(z)
+   prod = None
+   for k in range(first, 2**24):
+       if checkpoint is not None:
+           checkpoint.save(k)
+       s = k-1
        if s % 10000 == 0:
            print("Done ", s, " of ",2**24," tuples: ",100*s/2**24,"%", end='\r')
-       terms = [myels[i]**t[i] for i in range(24)]
-       prod = reduce((lambda x, y: x * y), terms)
-       if prod.order() ==1 or (prod*z).order()==1:
-           print("Found identity with tuple: ", t)
+       if prod is None:
+           t = [((k^(k>>1)) >> (23-i)) & 1 for i in range(24)]
+           prod = reduce((lambda x, y: x * y), [myels_G[i] for i in range(24) if t[i]])
+       else:
+           prod = prod * myels_G[24-(k & -k).bit_length()]
+       # Direct check
+       # t = [(k >> (23-i)) & 1 for i in range(24)]
+       # terms = [myels[i]**t[i] for i in range(24)]
+       # prod = reduce((lambda x, y: x * y), terms)
+       # if prod.order() ==1 or (prod*z).order()==1:
+       if prod.is_one() or (prod*z_G).is_one():
+           print("Found identity with tuple: ", [((k^(k>>1)) >> (23-i)) & 1 for i in range(24)])
            return False
-       s+=1
    print("all tests ok")
    return True
 
 
-# Check that verify_std_gens_G(a,b) returns True. 
+# Check that verify_std_gens_G(a,b) returns True. With the optional argument resume (a file name), the position in the loop over the $2^{24}$ tuples is saved regularly, and an interrupted run continues from there when called again (see mtools/checkpoint.py).
+# 
+# ***The products over the $2^{24}$ tuples are computed with the class GElt from mtools/gx0.py, which multiplies elements of $\mathbf{G}$ in mmgroup's internal representation of $\mathbf{G}$ (one product per tuple, by enumerating the tuples in Gray code order); this takes a few minutes instead of about an hour.***
 # 
 # ***Warning: this takes some time and is not needed for any subsequent calculations, so has been commented out.***
 
@@ -119,19 +152,15 @@ def verify_std_gens_G(a,b):
 
 
 # verify_std_gens_G(a,b)
+# verify_std_gens_G(a,b,resume="verify_std_gens_G.ckpt")
 
 
-# An implementation of the homomorphism $\pi : \mathbf{G} \to \mathrm{GL}_2(24)$ with $\pi(\mathbf{G}) \cong \mathrm{Co}_1$ defined in Section 2.4.
+# An implementation of the homomorphism $\pi : \mathbf{G} \to \mathrm{GL}_2(24)$ with $\pi(\mathbf{G}) \cong \mathrm{Co}_1$ defined in Section 2.4 (in mtools/helpers.py).
 
 # In[6]:
 
 
-def elt_to_24_mat(g):
-   mat = []
-   for i in range(24):
-       x = generators.gen_leech2_op_word_leech2(2**(23-i),g.mmdata,len(g.mmdata),0)
-       mat.append([int(d) for d in format((x %2**24), '#026b')[2:]])
-   return mat
+from mtools.helpers import elt_to_24_mat
 
 
 # Magma code for confirming that the matrices $A$ and $B$ computed as elt_to_24_mat(a) and elt_to_24_mat(b) generate $\mathrm{Co}_1 < \mathrm{GL}_2(24)$ can be found at:
@@ -145,71 +174,36 @@ def elt_to_24_mat(g):
 # * The input n is the number of product replacement steps that are performed before returning an element.
 # * The input init_already is an optional argument. If set to False, then 200 product replacements are performed and a random element of the resulting list is returned, regardless of the choice of n.
 # 
+# The function is defined in mtools/helpers.py.
+# 
 # ***Warning: this function alters the input list L in-place!***
 
 # In[7]:
 
 
-def get_random(L, n=1, init_already=True):
-    i = 0
-    if init_already == False:
-        for i in range(6):
-            L.append(random.choice(L))    
-        return get_random(L,200)
-    while i<n:
-        a = random.choice(range(0,len(L)))
-        b = a
-        while b == a:
-            b = random.choice(range(0,len(L)))
-        if random.choice([0,1]):
-            L[a] = L[a]*L[b]
-        else:
-            L[a] = L[b]*L[a]
-        i = i+1
-    return L[a]
+from mtools.helpers import get_random
 
 
 # A function that constructs a subgroup of $\mathbf{M}$ from a generating set.
 # * The input L is a list of mmgroup elements; the function returns a list of the elements comprising the subgroup of $\mathbf{M}$ generated by L.
 # * The input n is a 'desired' upper bound on the order of the subgroup generated by L; if more elements are found, then the function aborts.
 # * If the optional argument order_only is set to True, then the function only returns the order of the subgroup generated by L (and not the elements comprising this subgroup).
+# * If the optional argument verbose is set to False, then no progress is printed.
+# 
+# The function is defined in the module mtools/groups.py of this repository, so that it can also be called from worker processes.
 
 # In[8]:
 
 
-def group_generated_by(L, n, order_only=False):
-    start = time.time()
-    orb = [L[0]]
-    orbset = {tuple(L[0].as_tuples())}
-    os = 0
-    for el in L:
-        eltup = tuple(el.as_tuples())
-        if not eltup in orbset:
-            orb.append(el)
-            orbset.add(eltup)
-            os = os+1;
-             
-    j = 0
-    while j <= os:
-        for g in L:
-            el= orb[j]*g
-            eltup = tuple(el.as_tuples())
-            if not eltup in orbset:
-                orb.append(el)
-                orbset.add(eltup)
-                os = os+1;
-                    
-        j = j+1
-        end = time.time()       
-        print("Limit", n, "; have", os, "in time ", round(end-start,4), end='\r')
-        if len(orbset)>n:
-            print("Group is larger than imposed limit -- abort in time ", round(end-start,4) )
-            return False
-    
-    print("Limit", n, "; have", len(orb), "in time ", round(end-start,4), end='\r')
-    if order_only:
-        return len(orb)
-    return orb
+from mtools.groups import group_generated_by
+
+
+# A function commute_matrix(L1, L2) that tests which elements of a list L1 commute with which elements of a list L2 (by default L2 = L1), and returns the result as a NumPy boolean matrix. Each pair of distinct elements is tested only once; pairs of elements of $\mathbf{Q}$ are tested all at once via the symplectic form on the Leech lattice modulo $2$, and other pairs by comparing $xy$ with $yx$. The optional argument n_processes distributes the pairs over worker processes. The function all_commute(L1, L2) returns True if all entries of this matrix are True. Both functions are defined in the module mtools/commuting.py.
+
+# In[ ]:
+
+
+from mtools.commuting import commute_matrix, all_commute
 
 
 # ## Code accompanying Section 3
@@ -233,17 +227,23 @@ g13.order(), y6.order(), x6.order(), x3.order()
 
 # A function that checks whether the cyclic group generated by $y_6$ acts faithfully on the cyclic group generated by $g_{13}$.
 # 
-# ***This function is also used below for other cases.***
+# ***This function is also used below for other cases. The orbit of $g_{13}$ under conjugation by $y_6$ is computed with the orbit engine in mtools/orbits.py.***
 
 # In[10]:
 
 
+from mtools.orbits import orbit, CYCLIC_CONJUGATION
+
+# Direct check
+# def is_faithful(g,y):
+#     orbit = []
+#     for i in range(y.order()):
+#         if g**(y**i) not in orbit:
+#             orbit.append(g**(y**i))
+#     return len(orbit) == y.order()
+
 def is_faithful(g,y):
-    orbit = []
-    for i in range(y.order()):
-        if g**(y**i) not in orbit:
-            orbit.append(g**(y**i))
-    return len(orbit) == y.order()
+    return len(orbit(g, [y])) == y.order()
 
 is_faithful(g13,y6)
 
@@ -255,17 +255,23 @@ is_faithful(g13,y6)
 # In[11]:
 
 
-Comm(g13,c) == Comm(g13,d) == Comm(y6,c) == Comm(y6,d) == MM("M<1>")
+# Direct check
+# Comm(g13,c) == Comm(g13,d) == Comm(y6,c) == Comm(y6,d) == MM("M<1>")
+
+all_commute([g13,y6], [c,d])
 
 
-# Construct the subgroup $H = \langle c,d \rangle$ of $\mathbf{M}$, and check that it has order $5616 = \mathrm{PSL}_3(3)$.
+# Construct the subgroup $H = \langle c,d \rangle$ of $\mathbf{M}$, and check that it has order $5616 = \mathrm{PSL}_3(3)$. We use the function regular_rep from mtools/regular.py, which lists the elements of $H$ by the same search as group_generated_by (but starting with the identity, followed by $c$ and $d$), and also records the right multiplication by $c$ and $d$ as permutations of the list (NumPy index arrays). Products, inverses, orders and conjugates of elements of $H$ (and membership in $H$) can then be computed by array lookups instead of arithmetic in $\mathbf{M}$.
 # 
 # ***This takes 2-3 minutes.***
 
 # In[12]:
 
 
-H = group_generated_by([c,d], 10000)
+from mtools.regular import regular_rep
+
+H_rep = regular_rep([c,d], 10000)
+H = H_rep.elements
 
 
 # In[13]:
@@ -315,11 +321,18 @@ x6.as_tuples() in H_tuples and x3.as_tuples() in H_tuples
 
 
 # Check that each $g_6 = y_6x$ cubes to a $2\text{B}$-involution.
+# 
+# ***Here we use the function classify_involutions from mtools/involutions.py, which returns the output of conjugate_involution() (the class and an element conjugating the involution into $\mathrm{G}$) for each element of a list, computing it once for each distinct involution. The optional argument n_processes distributes the involutions over worker processes, and the optional argument cache names a file in which the results are kept, so that involutions classified in earlier runs or in other sections (below they are reused for the conjugation into $\mathrm{G}$) are not classified again.***
 
 # In[18]:
 
 
-all([((y6*x)**3).conjugate_involution()[0] == 2 for x in X])
+# Direct check
+# all([((y6*x)**3).conjugate_involution()[0] == 2 for x in X])
+
+from mtools.involutions import classify_involutions
+classes_X = classify_involutions([(y6*x)**3 for x in X], cache="involutions.pkl")
+all([k == 2 for k, h in classes_X])
 
 
 # Conjugate each $g_6$ into $\mathrm{G}$ (and check containment) and calculate its $\chi_\mathrm{M}$-value.
@@ -327,12 +340,11 @@ all([((y6*x)**3).conjugate_involution()[0] == 2 for x in X])
 # In[19]:
 
 
-for x in X:
-    h_x = ((y6*x)**3).conjugate_involution()[1]
+for x, (k, h_x) in zip(X, classes_X):
     print(((y6*x)**h_x).in_G_x0(), ((y6*x)**h_x).chi_G_x0()[0])
     
-# Delete the variable h_x
-del h_x
+# Delete the variables k and h_x
+del k, h_x
 
 
 # ### Code related to Remark 3.4
@@ -340,13 +352,19 @@ del h_x
 # Here we list our generators for the subgroups "$Y$" of the normalisers of $\langle g_6 \rangle$ for $g_6 = y_6x$. The involutions "$j_2$" inverting the $g_6$ can be found via random search in these subgroups using e.g. the function get_random defined above. (We do not provide these involutions here because the files in which we have stored them are up to 8GB in size.)
 # 
 # The following function checks whether $h \in \mathrm{M}$ normalises (the cyclic subgroup generated) by $g \in \mathrm{M}$.
+# 
+# ***It checks that the orbit of $\langle g \rangle$ under conjugation by $h$ has length $1$ (see mtools/orbits.py); conjugating $g$ once suffices, and the computation of the orbit stops at its second point.***
 
 # In[20]:
 
 
+# Direct check
+# def is_normalised(g,h):
+#     cyclic_g = [g**i for i in range(g.order())]
+#     return all([x**h in cyclic_g for x in cyclic_g])
+
 def is_normalised(g,h):
-    cyclic_g = [g**i for i in range(g.order())]
-    return all([x**h in cyclic_g for x in cyclic_g])
+    return orbit(g, [h], CYCLIC_CONJUGATION, max_length=1) is not False
 
 
 # Elements normalising $g_6 = y_6$ (and check).
@@ -453,13 +471,47 @@ i2 = MM("M<y_6ch*x_7ch*d_52ah*p_115885662*l_2*p_2787840*l_2*p_12552610*l_2*t_1*l
 a12 = MM("M<y_1afh*x_1661h*d_2ddh*p_208095583*l_2*p_1943040*l_2*p_1974295*l_2*t_2*l_2*p_1900800*l_2*p_10778*l_2*t_2*l_2*p_1900800*l_2*p_1868387*l_1*t_1*l_2*p_2956800*l_1*p_11159238*t_1*l_2*p_1985280*l_1*p_86275805*t_2*l_2*p_2386560*l_2*p_42712609*t_2*l_1*p_1499520*l_1*p_106699812>")
 
 
+# Presentations are checked with the class Presentation from mtools/presentations.py. A presentation is given by the names of its generators and a list of relators (words in the generators). The method verify evaluates all relators in one batch, so that common subwords and powers are computed only once, and checks that each relator is the identity. The optional argument n_processes distributes the relators over worker processes.
+
+# In[ ]:
+
+
+from mtools.presentations import Presentation
+
+
 # Check the presentation for $\mathrm{PSL}_2(13){:}2$.
 
 # In[27]:
 
 
 u, v = i2*(g6**4)*a12, g13
-u**2 == v**13 == (u*v**2)**4 == (u*v*u*v**4)**2 == MM("M<1>")
+PSL2_13_2 = Presentation(["u", "v"], ["u**2", "v**13", "(u*v**2)**4", "(u*v*u*v**4)**2"])
+PSL2_13_2.verify([u, v])
+
+
+# Coset enumeration over the trivial subgroup (see mtools/cosets.py) confirms that this presentation defines a group of order $2184 = |\mathrm{PSL}_2(13){:}2|$. Since $u$ and $v$ satisfy the presentation, $\langle u,v \rangle$ is a quotient of this group.
+
+# In[ ]:
+
+
+PSL2_13_2.order()
+
+
+# The group $\langle u,v \rangle$ also acts on the $14$ conjugates of $\langle v \rangle = \langle g_{13} \rangle$ (the Sylow $13$-subgroups). The function conjugation_rep from mtools/permrep.py computes this orbit and returns $u$ and $v$ as permutations of it. The permutation group has order $2184$, so the action is faithful, and element orders, cycle types and random elements of $\langle u,v \rangle$ can be computed with permutations of $14$ points instead of elements of $\mathbf{M}$; the method to_mm maps a word in $u$ and $v$ back to $\mathbf{M}$.
+
+# In[ ]:
+
+
+from mtools.permrep import conjugation_rep
+
+PSL2_13_2_perm = conjugation_rep([u, v], v, names=["u", "v"])
+PSL2_13_2_perm.degree, PSL2_13_2_perm.group_order()
+
+
+# In[ ]:
+
+
+PSL2_13_2_perm.order("u*v**2") == PSL2_13_2_perm.to_mm("u*v**2").order() == 4
 
 
 # In[28]:
@@ -497,14 +549,15 @@ group_generated_by([g13,g6,i2], 10000, order_only=True)
 
 # Check class fusion. (Per the proof, only certain classes need to be checked computationally.)
 # 
-# First construct the group $G = \langle g_{13},g_6,i_2,a_{13} \rangle \cong \mathrm{PSL}_2(13){:}2$.
+# First construct the group $G = \langle g_{13},g_6,i_2,a_{13} \rangle \cong \mathrm{PSL}_2(13){:}2$, together with its regular permutation representation (as for $H$ above).
 # 
 # ***This takes 2-3 minutes.***
 
 # In[32]:
 
 
-G = group_generated_by([g13,g6,i2,a12], 10000)
+G_rep = regular_rep([g13,g6,i2,a12], 10000)
+G = G_rep.elements
 
 
 # Confirm that $|G| = 2184$.
@@ -515,14 +568,56 @@ G = group_generated_by([g13,g6,i2,a12], 10000)
 len(G)
 
 
+# The element orders in $G$, computed from its multiplication table (a $2184 \times 2184$ array) without any further arithmetic in $\mathbf{M}$.
+
+# In[ ]:
+
+
+sorted(set(G_rep.orders().tolist()))
+
+
+# Centralisers, the elements inverting a given element, and the elements of a given order are found in the same way, by comparing rows and columns of the multiplication table (see mtools/regular.py), e.g. $\langle g_{13} \rangle$ is self-centralising in $G$, exactly $13$ elements of $G$ invert $g_{13}$, and $i_2$ is one of the elements inverting $g_6$. (For an element outside $G$, its conjugates under $G$ are computed first.)
+
+# In[ ]:
+
+
+C13, N13 = G_rep.centraliser(g13), G_rep.elements_inverting(g13)
+len(C13) == len(N13) == 13 and G_rep.index(i2) in G_rep.elements_inverting(g6) and len(G_rep.elements_of_order(13)) == 168
+
+
+# The conjugacy classes of $G$ are found in the same way, as the orbits of conjugation by the generators on the positions (see mtools/regular.py), together with their element orders, sizes and power maps. $G \cong \mathrm{PSL}_2(13){:}2$ has $15$ classes, and every cyclic subgroup of $G$ is conjugate to a subgroup of $\langle a_{12} \rangle$, $\langle g_{13} \rangle$ or $\langle g_{14} \rangle$, the maximal cyclic subgroups, of orders $12$, $13$ and $14$. So the classes in $\mathbb{M}$ of all elements of $G$ follow from those of $a_{12}$, $g_{13}$ and $g_{14}$ (and their powers), which are the only ones we need to check.
+
+# In[ ]:
+
+
+classes, G_orders = G_rep.conjugacy_classes(), G_rep.orders()
+[(int(G_orders[c[0]]), len(c)) for c in classes]
+
+
+# In[ ]:
+
+
+sorted(int(G_orders[classes[k][0]]) for k in G_rep.maximal_cyclic_subgroup_classes())
+
+
 # Construct the element $g_{14} = a_{12}i_2g_{13}^2$ of order $14$, conjugate its square $g_7$ into $\mathrm{G}$ (and check containment), and check that $\chi_\mathrm{M}(g_7) = 1$ so that $g_7 \in 7\text{B}$.
 
+# For the following checks we wrap $a_{12}$ as an element that remembers its order, powers, inverse, conjugates and the output of conjugate_involution() (see mtools/elements.py), so that e.g. $g_{14}^7$ and the element conjugating it into $\mathrm{G}$ are computed only once. Products with such elements are again such elements.
+
+# In[ ]:
+
+
+from mtools.elements import Elt
+
+a12 = Elt(a12)
+
+
 # In[34]:
 
 
 g14 = a12*i2*g13**2
 g7 = g14**2
-g14.order() == 14 and (g7).order() == 7 and (g14**7).conjugate_involution()[0] == 2 and (g7**((g14**7).conjugate_involution()[1])).chi_G_x0()[0] == 1
+g14.order() == 14 and g7.order() == 7 and (g14**7).conjugate_involution()[0] == 2 and (g7**((g14**7).conjugate_involution()[1])).chi_G_x0()[0] == 1
 
 
 # Check that $a_{12}$ has order $12$, conjugate it into $\mathrm{G}$, and check that $\chi_\mathrm{M}(a_{12}) = 13$, so that $a_{12} \in 12\text{H}$.
@@ -555,7 +650,9 @@ b3 = MM("M<y_1eeh*x_15e7h*d_0d65h*p_141989494*l_1*p_59473920*l_2*p_131767728*l_2
 # In[37]:
 
 
-x3**3 == x10**10 == (x3*x10)**11 == Comm(x3,x10)**2 == (x3*x10**-2*x3*x10**2)**2 == Comm(x3,x10**3)**2 == (x3*x10**-4*x3*x10**4)**2 == Comm(x3,x10**5)**2 == MM("M<1>")
+A12 = Presentation(["x3", "x10"], ["x3**3", "x10**10", "(x3*x10)**11", "Comm(x3,x10)**2", "(x3*x10**-2*x3*x10**2)**2",
+                                   "Comm(x3,x10**3)**2", "(x3*x10**-4*x3*x10**4)**2", "Comm(x3,x10**5)**2"])
+A12.verify([x3, x10])
 
 
 # Check that $\{a_2,a_3\}$ and $\{b_2,b_3\}$ satisfy the given presentation for $\mathrm{A}_5$. (The latter is needed in the proof of Proposition 4.2.)
@@ -563,7 +660,8 @@ x3**3 == x10**10 == (x3*x10)**11 == Comm(x3,x10)**2 == (x3*x10**-2*x3*x10**2)**2
 # In[38]:
 
 
-a2**2 == a3**3 == (a2*a3)**5 == MM("M<1>") and b2**2 == b3**3 == (b2*b3)**5 == MM("M<1>")
+A5 = Presentation(["a", "b"], ["a**2", "b**3", "(a*b)**5"])
+A5.verify([a2, a3]) and A5.verify([b2, b3])
 
 
 # ### Proof of Proposition 4.2
@@ -594,7 +692,7 @@ c5_G = MM("M<y_548h*x_34ah*d_0a9ch*p_243281095*l_1*p_1457280*l_2*p_43255315*t_2*
 # In[40]:
 
 
-g2_G**2 == g3_G**3 == (g2_G*g3_G)**5 == MM("M<1>")
+A5.verify([g2_G, g3_G])
 
 
 # Check that $g_2$ and $g_3$ lie in $\mathbf{G}$ (equivalently, that they commute with $c_2$).
@@ -634,7 +732,7 @@ h_T = MM("M<y_17eh*x_143ah*d_0c93h*p_48068830*l_2*p_2956800*l_1*p_43160055*t_2*l
 # In[44]:
 
 
-g2_T**2 == g3_T**3 == (g2_T*g3_T)**5 == MM("M<1>")
+A5.verify([g2_T, g3_T])
 
 
 # Check that $g_2 \in 2\text{B}$, that $i_2 \in 2\text{B}$, and that $i_2$ centralises $g_5$ but not $g_2$ or $g_3$.
@@ -658,7 +756,7 @@ i2_T**h_T == MM("M<x_1000h>") and (g5_T**h_T).in_G_x0() and (g5_T**h_T).chi_G_x0
 # In[47]:
 
 
-Comm(c2_T,g2_T) == Comm(c2_T,g3_T) == Comm(c3_T,g2_T) == Comm(c3_T,g3_T) == MM("M<1>")
+all_commute([c2_T,c3_T], [g2_T,g3_T])
 
 
 # #### Type B
@@ -680,7 +778,7 @@ h_B = MM("M<y_4f1h*x_9bch*d_0f77h*p_106507260*l_1*p_80762880*l_2*p_213375504*t_2
 # In[49]:
 
 
-g2_B**2 == g3_B**3 == (g2_B*g3_B)**5 == MM("M<1>")
+A5.verify([g2_B, g3_B])
 
 
 # Check that $g_2 \in 2\text{B}$, that $i_2 \in 2\text{B}$, and that $i_2$ centralises $g_5$ but not $g_2$ or $g_3$.
@@ -704,7 +802,7 @@ i2_B**h_B == MM("M<x_1000h>") and (g5_B**h_B).in_G_x0() and (g5_B**h_B).chi_G_x0
 # In[52]:
 
 
-c2_B.conjugate_involution()[0] == 1 and Comm(c2_B,g2_B) == Comm(c2_B,g3_B) == MM("M<1>")
+c2_B.conjugate_involution()[0] == 1 and all_commute([c2_B], [g2_B,g3_B])
 
 
 # It remains to check that when regarded as a subgroup of $\langle x_3,x_{10} \rangle \cong \mathrm{A}_{12}$, the group $\langle b_2,b_3 \rangle$ has the claimed orbit lengths on $\Omega = \{1,\dots,12\}$.
@@ -724,6 +822,33 @@ def A5_in_A12_gen_2(a,b): b = a**2 * b; w3 = b * a; w4 = b * w3; w5 = a * w3; w6
 A5_in_A12_gen_1(x3, x10) == b2 and A5_in_A12_gen_2(x3, x10) == b3
 
 
+# The same SLPs can also be read directly from the GAP file A5_in_A12_SLP.g (see mtools/slp.py). Both SLPs are merged into a single SLP with two outputs, so that the intermediate results they have in common are computed only once. This is faster than calling A5_in_A12_gen_1 and A5_in_A12_gen_2 separately.
+
+# In[ ]:
+
+
+from mtools.slp import read_gap_slps, perm_from_cycles, PERM_OPS
+
+A5_in_A12_slp = read_gap_slps("A5_in_A12_SLP.g", ["A5_in_A12_gen_1", "A5_in_A12_gen_2"])
+A5_in_A12_slp.evaluate([x3, x10], report=True) == [b2, b3]
+
+
+# Evaluating the same SLP on the permutations $y_3 = (1,2,3)$ and $y_{10} = (1,3)(2,4,5,6,7,8,9,10,11,12)$ from the GAP file confirms that the resulting $\mathrm{A}_5 < \mathrm{A}_{12}$ has orbits of lengths $6$ and $6$ on $\Omega$ (here numbered $0,\dots,11$).
+
+# In[ ]:
+
+
+A_perms = A5_in_A12_slp.evaluate([perm_from_cycles([(1,2,3)], 12), perm_from_cycles([(1,3),(2,4,5,6,7,8,9,10,11,12)], 12)], PERM_OPS)
+orbits = []
+for i in range(12):
+    if not any([i in orb for orb in orbits]):
+        orb = {i}
+        while len(orb | {int(p[j]) for p in A_perms for j in orb}) > len(orb):
+            orb = orb | {int(p[j]) for p in A_perms for j in orb}
+        orbits.append(orb)
+sorted([len(orb) for orb in orbits]) == [6,6]
+
+
 # GAP versions of the same SLPs, and GAP code showing that the $\mathrm{A}_5 < \mathrm{A}_{12}$ constructed from these SLPs (as described in the paper) has orbits of length $6$ and $6$ on $\Omega$, can be found at:
 # 
 # https://github.com/melissa-maths/M/blob/main/A5_in_A12_SLP.g
@@ -740,7 +865,9 @@ A5_in_A12_gen_1(x3, x10) == b2 and A5_in_A12_gen_2(x3, x10) == b3
 g5_G.chi_G_x0()[2] == (g5_B**h_B).chi_G_x0()[2] == 1 and (g5_T**h_T).chi_G_x0()[2] == 6
 
 
-# The arguments in Section 5 also refer to elements generating certain 'large' subgroups $Y$ of the normalisers of the elements $g_5$ (for each of the three cases). These elements are as follows, with checks that they normalise the corresponding $g_5$. The involutions "$j_2$" inverting the $g_5$ can be found via random search in the groups generated by the corresponding elements (using e.g. the function get_random).
+# The arguments in Section 5 also refer to elements generating certain 'large' subgroups $Y$ of the normalisers of the elements $g_5$ (for each of the three cases). These elements are as follows, with checks that they normalise the corresponding $g_5$.
+# 
+# ***The checks are registered in a ClaimStore (see mtools/claims.py), which keeps their results in the file maximals_of_M_claims.json together with a hash of their inputs (the elements and the function is_normalised) and of their code. When the notebook is run again, a check is only evaluated if one of its inputs or its code has changed, e.g. if one of the listings is edited; otherwise its stored result is reused. Other claims can be registered in the same way, and claims.report() lists the claims that were reused and recomputed in the current run.*** The involutions "$j_2$" inverting the $g_5$ can be found via random search in the groups generated by the corresponding elements (using e.g. the function get_random).
 
 # In[56]:
 
@@ -762,8 +889,13 @@ normaliser_of_g5_G = [MM("M<y_401h*x_0c4dh*d_193h*p_214145658*l_2*p_2880*l_2*p_1
  MM("M<y_1a4h*x_68dh*d_270h*p_570798*l_2*p_1943040*l_2*p_53370860*t_1*l_1*p_2027520*l_1*p_1397931*l_2*t_1*l_1*p_172128000*t_2*l_2*p_1900800*l_2*p_8642*t_1*l_2*p_1943040*l_2*p_21440992>"),
  MM("M<y_4c2h*x_0c5ch*d_0eb4h*p_173437846*l_2*p_69674880*l_1*p_199626288*t_2*l_1*p_49272960*l_2*p_240873600*l_2*t_1*l_1*p_2999040*l_1*p_1948448*l_2*t_2*l_2*p_1900800*l_2*p_1056394*t_1*l_2*p_1985280*l_1*p_42728035*t_1*l_2*p_2830080*l_2*p_42712720*t_2*l_1*p_1499520*l_2*p_85332899>")]
 
-# Check
-all([is_normalised(g5_G,h) for h in normaliser_of_g5_G])
+from mtools.claims import ClaimStore
+claims = ClaimStore("maximals_of_M_claims.json")
+
+# Direct check
+# all([is_normalised(g5_G,h) for h in normaliser_of_g5_G])
+
+claims.check("normaliser_of_g5_G", [is_normalised, g5_G, normaliser_of_g5_G], lambda: all([is_normalised(g5_G,h) for h in normaliser_of_g5_G]))
 
 
 # In[57]:
@@ -782,8 +914,10 @@ normaliser_of_g5_T = [MM("M<y_66h*x_1e9dh*d_0f2ah*p_137492110*l_2*p_1985280*l_1*
  MM("M<y_49eh*x_10b5h*d_0b9fh*p_105135069*l_2*p_59473920*l_2*p_63909312*t_2*l_2*p_2597760*l_1*p_10667802*l_2*t_1*l_2*p_1858560*l_1*p_465792*l_2*p_499200*t_2*l_2*p_1457280*l_1*p_1901124*t_2*l_2*p_2597760*l_1*p_85372329*t_1*l_1*p_1499520*l_2*p_42796354*t_2*l_1*p_3254400*l_2>"),
  MM("M<y_8ch*x_1484h*d_514h*p_30834449*l_2*p_2597760*l_1*p_43613397*t_1*l_2*p_1943040*l_2*p_13058419*l_2*t_2*l_1*p_199680*t_1*l_2*p_2830080*l_2*p_53823776*t_1*l_2*p_2830080*l_2*p_21347617*t_2*l_2*p_2386560*l_2*p_53907499>")]
 
-# Check
-all([is_normalised(g5_T,h) for h in normaliser_of_g5_T])
+# Direct check
+# all([is_normalised(g5_T,h) for h in normaliser_of_g5_T])
+
+claims.check("normaliser_of_g5_T", [is_normalised, g5_T, normaliser_of_g5_T], lambda: all([is_normalised(g5_T,h) for h in normaliser_of_g5_T]))
 
 
 # In[58]:
@@ -806,8 +940,16 @@ normaliser_of_g5_B = [MM("M<y_0b7h*x_8e8h*d_873h*p_125664661*l_2*p_1985280*l_1*p
  MM("M<y_103h*x_4d9h*d_16ch*p_56537890*l_1*p_2640000*l_1*p_21888598*t_1*l_1*p_1394880*l_1*p_11616240*l_1*t_2*l_1*p_1394880*l_2*p_21360*l_1*p_107520*t_2*l_2*p_6720*l_1*t_1*l_2*p_2344320*l_2*p_65491*t_2*l_2*p_1985280*l_1*p_85331939*t_2*l_2*p_2956800*l_1*p_64017978*t_1*l_2*p_1943040*l_2*p_96461345>"),
  MM("M<y_41dh*x_19a7h*d_41bh*p_105177535*l_1*p_1499520*l_1*p_10688160*t_2*l_1*p_466560*l_1*p_1904160*l_2*t_1*l_2*p_2956800*l_1*p_2410055*l_2*t_1*l_2*p_1943040*l_2*p_42718449*t_1*l_2*p_2597760*l_1*p_96021712*t_2*l_2*p_1985280*l_1*p_63999749*t_1*l_1*p_2640000*l_1*p_14426>")]
 
-# Check
-all([is_normalised(g5_B,h) for h in normaliser_of_g5_B])
+# Direct check
+# all([is_normalised(g5_B,h) for h in normaliser_of_g5_B])
+
+claims.check("normaliser_of_g5_B", [is_normalised, g5_B, normaliser_of_g5_B], lambda: all([is_normalised(g5_B,h) for h in normaliser_of_g5_B]))
+
+
+# In[ ]:
+
+
+claims.report()
 
 
 # In the "type B" case, we assert that there are exactly 40 involutions that invert $g_5$ and extend $A_B \cong \mathrm{A}_5$ to a subgroup of $\mathbf{M}$ isomorphic to $\mathrm{PSL}_2(16)$ that does not extend to an almost simple maximal subgroup. Here are the claimed 40 involutions for reference.
@@ -862,7 +1004,7 @@ involutions_inverting_g5_B = [MM("M<y_1a6h*x_1126h*d_4b0h*p_114554739*l_2*p_2344
 # In[60]:
 
 
-all([g5_B**x == g5_B**-1 and Comm(c2_B,x) == MM("M<1>") for x in involutions_inverting_g5_B])
+all([g5_B**x == g5_B**-1 for x in involutions_inverting_g5_B]) and all_commute([c2_B], involutions_inverting_g5_B)
 
 
 # ## Code accompanying Section 6
@@ -907,7 +1049,17 @@ u5.order() == 5 and j2.conjugate_involution()[0] == 2 and u5**j2 == u5**-1
 # In[64]:
 
 
-j2**2 == g3**3 == (j2*g3**-1*j2*g3)**5 == (j2*g3)**15 == ((j2*g3)**3*(j2*g3**-1)**3)**3 == (j2*g3**-1*(j2*g3)**5)**4 == MM("M<1>")
+PSU3_4 = Presentation(["j2", "g3"], ["j2**2", "g3**3", "(j2*g3**-1*j2*g3)**5", "(j2*g3)**15", "((j2*g3)**3*(j2*g3**-1)**3)**3",
+                                     "(j2*g3**-1*(j2*g3)**5)**4"])
+PSU3_4.verify([j2, g3])
+
+
+# Coset enumeration over the trivial subgroup confirms that this presentation defines a group of order $62400 = |\mathrm{PSU}_3(4)|$; this takes a few seconds. Since $\mathrm{PSU}_3(4)$ is simple and $j_2 \neq 1$, it follows that $\langle j_2,g_3 \rangle \cong \mathrm{PSU}_3(4)$. (The subgroup $S$ is nevertheless constructed below, because its elements are needed in the proof of Proposition 6.1.)
+
+# In[ ]:
+
+
+PSU3_4.order()
 
 
 # Check that $c_5$ and $j_2$ do not commute, so that $S = \langle g_2,g_3,c_5,j_2 \rangle \cong \mathrm{PSU}_3(4)$ has trivial centraliser in $\mathrm{M}$.
@@ -918,14 +1070,14 @@ j2**2 == g3**3 == (j2*g3**-1*j2*g3)**5 == (j2*g3)**15 == ((j2*g3)**3*(j2*g3**-1)
 Comm(c5,j2) == MM("M<1>")
 
 
-# Construct $S \cong \mathrm{PSU}_3(4)$ and confirm that it has order $62400$.
+# Construct $S \cong \mathrm{PSU}_3(4)$ and confirm that it has order $62400$. A snapshot of the construction is saved in the file S.ckpt every minute, so that an interrupted construction continues from the last snapshot when this cell is run again (and a finished one is simply read from the file).
 # 
 # ***Warning: this takes about an hour!***
 
 # In[66]:
 
 
-S = group_generated_by([g2,g3,c5,j2], 100000)
+S = group_generated_by([g2,g3,c5,j2], 100000, resume="S.ckpt")
 
 
 # In[67]:
@@ -970,6 +1122,16 @@ all([(x**a12).as_tuples() in S_tuples for x in [g2,g3,c5,j2]])
 # 
 # Check that $a_{12}^6 \in 2\text{B}$ and $a_{12}^2 \in 6\text{F}$.
 
+# As in Section 3, we wrap $a_{12}$ and $c_5$ as elements that remember their powers, conjugates and the output of conjugate_involution(), so that e.g. $a_{12}^6$, $c_5^3$, $g_{10}^5$ and $h_{10}^5$ (and the elements conjugating them into $\mathrm{G}$) are computed only once in the checks below.
+
+# In[ ]:
+
+
+from mtools.elements import Elt
+
+a12, c5 = Elt(a12), Elt(c5)
+
+
 # In[71]:
 
 
@@ -1073,36 +1235,28 @@ g13
 # 
 # http://www.monstrous-moonshine.de/~gerald/monster/
 # 
-# Per the proof of Proposition 6.2, it shows that $g_{13} \in 13\text{B}$ by calculating the trace of $g_{13}$ in its action on the reducible $\mathbb{F}_3\mathbf{M}$-module of dimension $196884$.
+# Per the proof of Proposition 6.2, it shows that $g_{13} \in 13\text{B}$ by calculating the trace of $g_{13}$ in its action on the reducible $\mathbb{F}_3\mathbf{M}$-module of dimension $196884$. The function trace_mod_3 and its auxiliary functions are defined in mtools/helpers.py.
 
 # In[83]:
 
 
-# define the reducible M-module V of dimension 196884 over the field of order 3
-V = MMV(3)
-
-# auxiliary function
-def partial_trace_mod_3(start, end, g):
-    return sum([(V([('E', i)]) * g)['E'][i] % 3 for i in range(start, end)])
-
-# function to calculate the trace of g acting on V
-def trace_mod_3(g, n_processes=1):
-    chunk_size = 196884 // n_processes
-    start_indices = [i * chunk_size for i in range(n_processes)]
-    end_indices = [(start + chunk_size) if i < n_processes - 1 else 196884 for i, start in enumerate(start_indices)]
-    with mp.Pool(n_processes) as pool:
-        results = pool.starmap(partial_trace_mod_3, [(start, end, g) for start, end in zip(start_indices, end_indices)])
-    return sum(results) %3
+from mtools.helpers import trace_mod_3
 
 
 # Check. Per the proof, the output should be $-1$ mod $3$.
 # 
 # ***Warning: this can take a while! It also does not seem to run properly in Jupyter Notebook due to some issue with the multiprocessing package, so it is recommended to run it in a terminal. Given that it also does not affect any subsequent calculations, we have commented it out here.***
+# 
+# With the optional argument resume (a file name), the partial traces of the finished chunks of the basis of $V$ are saved in that file, and a second call with the same arguments only computes the missing chunks. In this case it is advisable to use many more chunks than processes (optional argument n_chunks), so that little work is lost if the computation is interrupted.
+# 
+# With the optional argument address (e.g. ("", 50000)), the chunks are handed out by a job coordinator listening at that address (see mtools/jobs.py) instead of a local pool; further hosts can then contribute workers with run_worker(("coordinator.host", 50000), n_processes=...), which import the chunk function chunk_trace_mod_3 from mtools/helpers.py. The coordinator and the workers authenticate each other with a secret key (the optional argument authkey, or the environment variable MTOOLS_AUTHKEY on each host, e.g. set to the output of new_authkey() from mtools/jobs.py). The key is required when the coordinator listens on an address other than localhost, and must be kept secret, since anyone who can connect to the coordinator with it can run code on the coordinator and the workers.
 
 # In[84]:
 
 
 #trace_mod_3(g13, 100)
+#trace_mod_3(g13, 100, resume="trace_mod_3.ckpt", n_chunks=1000)
+#trace_mod_3(g13, 100, resume="trace_mod_3.ckpt", n_chunks=1000, address=("", 50000))
 
 
 # ## Code accompanying Section 7
@@ -1131,14 +1285,29 @@ h7 = MM("M<y_3d6h*x_125dh*d_259h*p_81455268>")
 y.in_Q_x0() and (z*y).in_Q_x0() and Comm(h7,z) == Comm(h7,y) == MM("M<1>") and h7.in_G_x0() and h7.order() == 7 and all([(h7**i).chi_G_x0()[0] == 50 for i in [1,2,3,4,5,6]])
 
 
+# Since $z$ and $y$ lie in $\mathbf{Q}$, their classes can also be read off from the types of their images in the Leech lattice modulo $2$ (see mtools/leech2.py): a non-central element of $\mathbf{Q}$ is a $2\text{A}$-involution if its image has type $2$, and a $2\text{B}$-involution if its image has type $4$ (the central involution $z$ is also of class $2\text{B}$). The function type_histogram counts the elements of each type in the subgroup of $\mathbf{Q}$ generated by a list of elements, and is_2B_pure checks that all its involutions are of class $2\text{B}$. Here $y$ and $zy$ have type $4$.
+
+# In[ ]:
+
+
+from mtools import leech2
+
+leech2.is_2B_pure([z,y]) and list(leech2.type_histogram([z,y])) == [2,0,0,0,2]
+
+
 # ### Proof of Proposition 7.2
 # 
 # Check that $e_i \in \mathbf{Q} \cap 2\text{B}$ for $i \in \{1,2,3\}$ and that $g_7 \in \mathbf{G} \cap 7\text{B}$. (Note that $7\text{B}$-elements have $\chi_\mathbf{M}$-value $1$.)
+# 
+# ***As for Lemma 7.1, the classes of the $e_i$ are read off from the types of their images in the Leech lattice modulo $2$; a direct check (commented out) is also possible.***
 
 # In[87]:
 
 
-all([e.in_G_x0() and e.order() == 2 and e.conjugate_involution()[0] == 2 for e in [e1,e2,e3]]) and g7.in_G_x0() and g7.chi_G_x0()[0] == 1 
+# Direct check
+# all([e.in_G_x0() and e.order() == 2 and e.conjugate_involution()[0] == 2 for e in [e1,e2,e3]]) and g7.in_G_x0() and g7.chi_G_x0()[0] == 1 
+
+all([e.in_Q_x0() for e in [e1,e2,e3]]) and all(leech2.involution_class(leech2.as_array([e1,e2,e3])) == 2) and g7.in_G_x0() and g7.chi_G_x0()[0] == 1
 
 
 # Calculate the image $m_7$ of $g_7$ under the projection $\pi: \mathbf{G} \rightarrow \mathrm{Co}_1 < \mathrm{GL}_{24}(2)$.
@@ -1400,16 +1569,12 @@ orbit_rep_vectors = [
 ]
 
 
-# The following code converts the (vector) orbit representatives to (mmgroup) elements of $\mathbf{Q} < \mathbf{M}$.
+# The following code converts the (vector) orbit representatives to (mmgroup) elements of $\mathbf{Q} < \mathbf{M}$, with the functions vector_to_integer and integer_to_element from mtools/helpers.py.
 
 # In[91]:
 
 
-def vector_to_integer(v):
-    return sum([2**(23-i)*v[i] for i in range(24)])
-    
-def integer_to_element(x):
-    return MM(XLeech2(x))
+from mtools.helpers import vector_to_integer, integer_to_element
 
 orbit_rep_mmgroup = [integer_to_element(vector_to_integer(v)) for v in orbit_rep_vectors]
 
@@ -1421,17 +1586,23 @@ all([x.in_Q_x0() for x in orbit_rep_mmgroup])
 
 
 # The following code checks the preimage $x \in \mathbf{Q} < \mathbf{M}$ of each orbit representative to determine whether either element of the coset $xZ(\mathbf{Q})$ extends $\langle g_7 \rangle$ to a group of order $|2^3{:}7|=56$.
+# 
+# ***Here we use the function filter_good_2B from mtools/involutions.py, which tests each coset $xZ(\mathbf{Q})$ once: $x$ and $xz$ are conjugate in $\mathbf{Q}$, and a necessary condition for $\langle g_7,x \rangle \cong 2^3{:}7$ is that $x$ commutes with its conjugates under $g_7$, so the order of $\langle g_7,x \rangle$ is only computed for cosets passing the cheaper tests. The optional argument n_processes distributes the cosets over worker processes. A direct check (commented out) is also possible but takes longer.***
 
 # In[93]:
 
 
-good_2B = []
-for x in orbit_rep_mmgroup:
-    if x.order() == 2 and x.conjugate_involution()[0] == 2 and group_generated_by([g7,x], 100, order_only=True) == 56:
-        good_2B.append(x)
-    x = x*MM("M<x_1000h>")
-    if x.order() == 2 and x.conjugate_involution()[0] == 2 and group_generated_by([g7,x], 100, order_only=True) == 56:
-        good_2B.append(x)
+# Direct check (takes longer)
+# good_2B = []
+# for x in orbit_rep_mmgroup:
+#     if x.order() == 2 and x.conjugate_involution()[0] == 2 and group_generated_by([g7,x], 100, order_only=True) == 56:
+#         good_2B.append(x)
+#     x = x*MM("M<x_1000h>")
+#     if x.order() == 2 and x.conjugate_involution()[0] == 2 and group_generated_by([g7,x], 100, order_only=True) == 56:
+#         good_2B.append(x)
+
+from mtools.involutions import filter_good_2B
+good_2B = filter_good_2B(g7, orbit_rep_mmgroup)
 
 
 # Confirm that the only elements that pass this test are $e_1$, $e_2$, and $e_3$.
@@ -1447,18 +1618,35 @@ len(good_2B) == 3 and all(x in good_2B for x in [e1,e2,e3])
 # In[95]:
 
 
-E1 = [e1**(g7**i) for i in range(g7.order())]
-E2 = [e2**(g7**i) for i in range(g7.order())]
-E3 = [e3**(g7**i) for i in range(g7.order())]
-len([x.as_tuples() for x in E1]) == len([x.as_tuples() for x in E2]) == len([x.as_tuples() for x in E3]) == 7
+E1 = orbit(e1, [g7])
+E2 = orbit(e2, [g7])
+E3 = orbit(e3, [g7])
+len(E1) == len(E2) == len(E3) == 7
+
+
+# The same orbits can also be computed inside $\mathbf{Q}$, with elements of $\mathbf{Q}$ encoded as $25$-bit integers (see mtools/leech2.py). Here the conjugation action of $g_7$ is computed directly on the Leech lattice modulo $2$, and products in $\mathbf{Q}$ are bit operations. This also confirms that each orbit spans a subgroup of order $8$.
+
+# In[ ]:
+
+
+from mtools import leech2
+
+E_leech2 = [leech2.orbit(leech2.from_mm(e), [g7]) for e in [e1,e2,e3]]
+all([len(E) == 7 and len(leech2.span(E)) == 8 for E in E_leech2])
 
 
 # Confirm that the normal subgroup $2^3$ of each $B_i$ is $2\text{B}$-pure.
+# 
+# ***Here all elements of the subgroup of $\mathbf{Q}$ spanned by each orbit are classified at once via the Leech lattice modulo $2$, as for Lemma 7.1.***
 
 # In[96]:
 
 
-all(x.conjugate_involution()[0] == 2 for x in E1+E2+E3)
+# Direct check
+# all(x.conjugate_involution()[0] == 2 for x in E1+E2+E3)
+# all(k == 2 for k, h in classify_involutions(E1+E2+E3, cache="involutions.pkl"))
+
+all(leech2.is_2B_pure(E) for E in E_leech2)
 
 
 # ### Remark 7.3
@@ -1469,7 +1657,8 @@ all(x.conjugate_involution()[0] == 2 for x in E1+E2+E3)
 
 
 pairs = [E1[:2], E2[:2], E3[:2]]
-all([(p[1]**(p[0].conjugate_involution()[1])).chi_G_x0()[1] == 43 for p in pairs])
+classes_pairs = classify_involutions([p[0] for p in pairs], cache="involutions.pkl")
+all([(p[1]**h).chi_G_x0()[1] == 43 for p, (k, h) in zip(pairs, classes_pairs)])
 
 
 # ### Remark 7.4
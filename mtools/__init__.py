@@ -0,0 +1 @@
+"""Helper code shared by the computations in maximals_of_M.py and other_gens.py."""
@@ -0,0 +1,69 @@
+"""Snapshots of long-running computations, so that they can be resumed.
+
+A Checkpoint writes the state of a computation to a file (with pickle) at
+most every interval seconds; the file is replaced atomically, so an
+interrupted write leaves the previous snapshot intact. A computation started
+with a Checkpoint on the same file continues from the last snapshot. Lists of
+mmgroup elements are stored compactly via pack/unpack.
+"""
+
+import os
+import pickle
+import time
+
+import numpy as np
+
+from mmgroup import MM
+
+
+# A list of mmgroup elements as a pair of NumPy arrays (the concatenated internal
+# representations of the elements and their lengths), and back.
+def pack(elements):
+    data = [g.mmdata for g in elements]
+    lengths = np.array([len(d) for d in data], dtype=np.uint32)
+    return np.concatenate(data + [np.zeros(0, dtype=np.uint32)]).astype(np.uint32), lengths
+
+# The packed elements were reduced, so they are marked as reduced again.
+def unpack(packed):
+    data, lengths = packed
+    ends = np.cumsum(lengths, dtype=np.int64)
+    elements = []
+    for e, l in zip(ends, lengths.astype(np.int64)):
+        g = MM('a', data[e-l:e])
+        g.reduced = True
+        elements.append(g)
+    return elements
+
+
+class Checkpoint:
+    # path is the file of the snapshots; key identifies the computation (e.g. its
+    # input), so that a snapshot of a different computation is not resumed.
+    def __init__(self, path, key=None, interval=60):
+        self.path = path
+        self.key = key
+        self.interval = interval
+        self.last = time.time()
+
+    # The state of the last snapshot, or None if there is none.
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            key, state = pickle.load(f)
+        if key != self.key:
+            raise ValueError("the snapshot in %s belongs to a different computation" % self.path)
+        return state
+
+    # Write a snapshot of state, if the last one is older than interval seconds
+    # (or if force is True). state may also be a function returning the state, so
+    # that it is only computed when a snapshot is actually written.
+    def save(self, state, force=False):
+        if not force and time.time() - self.last < self.interval:
+            return
+        if callable(state):
+            state = state()
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((self.key, state), f)
+        os.replace(tmp, self.path)
+        self.last = time.time()
@@ -0,0 +1,96 @@
+"""A store of results of claims, keyed by hashes of their inputs and code.
+
+A claim is a function without arguments returning True or False, together with
+a name and the list of its inputs (mmgroup elements, numbers, strings, lists of
+these, and functions). ClaimStore.check evaluates a claim only if its inputs
+or its code changed since the result was stored; otherwise the stored result
+is reused. The store is a JSON file, written atomically after each new result,
+so an interrupted run keeps the results computed so far.
+
+An mmgroup element enters the hash through its reduced word (as_tuples()), a
+function through its compiled code (including nested functions and constants),
+so that editing an element or the code of a claim invalidates its result.
+Functions called by a claim are identified by their names only, unless they
+are also listed as inputs.
+"""
+
+import hashlib
+import json
+import os
+import time
+import types
+
+from mmgroup import MM
+
+
+# A string determining x, for x as in the inputs of a claim.
+def fingerprint(x):
+    if isinstance(x, MM):
+        return "MM%r" % (x.as_tuples(),)
+    if isinstance(x, (list, tuple)):
+        return "[%s]" % ",".join(fingerprint(y) for y in x)
+    if isinstance(x, dict):
+        return "{%s}" % ",".join("%r:%s" % (k, fingerprint(v)) for k, v in sorted(x.items()))
+    if isinstance(x, types.FunctionType):
+        return "F" + _code_fingerprint(x.__code__)
+    if isinstance(x, types.CodeType):
+        return "C" + _code_fingerprint(x)
+    return repr(x)
+
+def _code_fingerprint(c):
+    consts = [_code_fingerprint(k) if isinstance(k, types.CodeType) else repr(k) for k in c.co_consts]
+    return "%s|%s|%s" % (c.co_code.hex(), ",".join(consts), ",".join(c.co_names))
+
+def claim_hash(inputs, fn):
+    return hashlib.sha256((fingerprint(list(inputs)) + "#" + fingerprint(fn)).encode()).hexdigest()
+
+
+class ClaimStore:
+    def __init__(self, path="claims.json"):
+        self.path = path
+        self.results = {}
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                self.results = json.load(f)
+        self.reused = []
+        self.recomputed = []
+
+    def __repr__(self):
+        return "<ClaimStore %s: %d claims, %d reused, %d recomputed>" % (
+            self.path, len(self.results), len(self.reused), len(self.recomputed))
+
+    # The stored result of the claim name with the given hash, or None.
+    def lookup(self, name, key):
+        r = self.results.get(name)
+        if r is not None and r["hash"] == key:
+            self.reused.append(name)
+            return r["result"]
+        return None
+
+    def record(self, name, key, result, seconds=0.0):
+        self.results[name] = {"hash": key, "result": bool(result), "seconds": round(seconds, 2)}
+        self.recomputed.append(name)
+        self.save()
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.results, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    # Returns fn() (as a bool), evaluating it only if the claim name has no stored
+    # result for the same inputs and code.
+    def check(self, name, inputs, fn):
+        key = claim_hash(inputs, fn)
+        result = self.lookup(name, key)
+        if result is None:
+            t = time.time()
+            result = bool(fn())
+            self.record(name, key, result, time.time() - t)
+        return result
+
+    # The names of the claims whose results were reused and recomputed in this run.
+    def report(self):
+        return {"reused": list(self.reused), "recomputed": list(self.recomputed)}
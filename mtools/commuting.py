@@ -0,0 +1,71 @@
+"""Batched tests whether elements of the Monster commute.
+
+The function commute_matrix(L1, L2) returns the boolean matrix with entry [i,j]
+True if and only if L1[i] and L2[j] commute. Elements are identified by their
+words (as_tuples()), so that each pair of distinct elements is tested once,
+however often it occurs. Pairs of elements of Q_x0 are tested with the
+symplectic form on the Leech lattice mod 2 (see mtools/leech2.py), all at once;
+other pairs are tested by comparing x*y with y*x, which is cheaper than
+comparing the commutator of x and y with the identity.
+"""
+
+import multiprocessing as mp
+
+import numpy as np
+
+from . import leech2
+
+
+# x and y commute; mmgroup compares two elements without reducing them
+def commutes(x, y):
+    return x.group._equal_words(x*y, y*x)
+
+
+def _commutes_pairs(elts, pairs):
+    return [commutes(elts[i], elts[j]) for i, j in pairs]
+
+
+# Returns the NumPy boolean array C of shape (len(L1), len(L2)) with C[i,j] True if
+# and only if L1[i] and L2[j] commute; if L2 is omitted, it is taken to be L1.
+# The pairs not in Q_x0 are distributed over n_processes worker processes.
+def commute_matrix(L1, L2=None, n_processes=1):
+    L2 = L1 if L2 is None else L2
+    # the distinct elements of L1 and L2
+    index, elts = {}, []
+    for x in list(L1) + list(L2):
+        key = tuple(x.as_tuples())
+        if not key in index:
+            index[key] = len(elts)
+            elts.append(x)
+    idx1 = np.array([index[tuple(x.as_tuples())] for x in L1], dtype=np.int64)
+    idx2 = np.array([index[tuple(x.as_tuples())] for x in L2], dtype=np.int64)
+    n = len(elts)
+    C = np.eye(n, dtype=bool)
+
+    # elements of Q_x0: commute if and only if their scalar product is 0
+    in_Q = np.array([x.in_Q_x0() for x in elts], dtype=bool)
+    Q = np.flatnonzero(in_Q)
+    if len(Q):
+        v = leech2.as_array([elts[i] for i in Q])
+        C[np.ix_(Q, Q)] = leech2.commute(v[:,None], v[None,:])
+
+    # all other pairs {i,j} with i < j that occur in the matrix
+    pairs = sorted(set((min(i,j), max(i,j)) for i in set(idx1.tolist()) for j in set(idx2.tolist())
+                       if i != j and not (in_Q[i] and in_Q[j])))
+    if n_processes == 1 or len(pairs) < 2:
+        results = _commutes_pairs(elts, pairs)
+    else:
+        chunks = [pairs[k::n_processes] for k in range(n_processes)]
+        with mp.Pool(n_processes) as pool:
+            chunk_results = pool.starmap(_commutes_pairs, [(elts, chunk) for chunk in chunks])
+        results = [None] * len(pairs)
+        for k, r in enumerate(chunk_results):
+            results[k::n_processes] = r
+    for (i, j), c in zip(pairs, results):
+        C[i,j] = C[j,i] = c
+    return C[np.ix_(idx1, idx2)]
+
+
+# True if every element of L1 commutes with every element of L2 (arguments as above).
+def all_commute(L1, L2=None, n_processes=1):
+    return bool(commute_matrix(L1, L2, n_processes).all())
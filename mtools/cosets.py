@@ -0,0 +1,171 @@
+"""Todd-Coxeter coset enumeration for finitely presented groups.
+
+Given a presentation (see mtools/presentations.py) and a list of words
+generating a subgroup H of the presented group, enumerate_cosets computes the
+coset table of H, i.e. the action of the generators and their inverses on the
+right cosets of H, by the HLT strategy (Hasselgrove, Leech and Trotter) as
+described in Holt, Eick and O'Brien, Handbook of Computational Group Theory,
+Section 5.1. The enumeration terminates if H has finite index; if H is the
+trivial subgroup, the index is the order of the presented group.
+
+If group elements satisfy the relators of the presentation (which can be
+checked with Presentation.verify), then the group they generate is a quotient
+of the presented group, so its order divides the order found here.
+"""
+
+import numpy as np
+
+from .words import parse_word
+
+
+# Flatten a parsed word (see mtools/words.py) into the list of columns of the
+# coset table of its letters; generator k has the columns 2k and 2k+1 (for its
+# inverse).
+def _columns(w, gens):
+    cols = []
+    for base, e in w:
+        if isinstance(base, str):
+            c = 2*gens.index(base)
+            cols += [c if e > 0 else c ^ 1] * abs(e)
+        else:
+            sub = _columns(base, gens)
+            if e < 0:
+                sub = [c ^ 1 for c in reversed(sub)]
+            cols += sub * abs(e)
+    return cols
+
+
+class CosetTable:
+    # table is a NumPy int32 array with one row for each coset (coset 0 is H
+    # itself) and the columns g_0, g_0^-1, g_1, g_1^-1, ... for the generators.
+    def __init__(self, gens, table):
+        self.gens = list(gens)
+        self.table = table
+        self.index = len(table)
+
+    def __len__(self):
+        return self.index
+
+    def __repr__(self):
+        return "<CosetTable on %s with %d cosets>" % (", ".join(self.gens), self.index)
+
+    # The coset reached from the given coset by applying the word w.
+    def act(self, coset, w):
+        for c in _columns(parse_word(w) if isinstance(w, str) else w, self.gens):
+            coset = self.table[coset, c]
+        return int(coset)
+
+
+class _Enumeration:
+    def __init__(self, n_cols, max_cosets):
+        self.n_cols = n_cols
+        self.max_cosets = max_cosets
+        self.table = [[-1] * n_cols]
+        self.p = [0]      # p[k] == k for live cosets; otherwise p[k] < k
+
+    def define(self, c, x):
+        if len(self.table) >= self.max_cosets:
+            raise ValueError("coset enumeration exceeded %d cosets" % self.max_cosets)
+        d = len(self.table)
+        self.table.append([-1] * self.n_cols)
+        self.p.append(d)
+        self.table[c][x] = d
+        self.table[d][x ^ 1] = c
+
+    def rep(self, k):
+        p = self.p
+        r = k
+        while p[r] != r:
+            r = p[r]
+        while p[k] != r:
+            p[k], k = r, p[k]
+        return r
+
+    def merge(self, k, l, queue):
+        k, l = self.rep(k), self.rep(l)
+        if k != l:
+            k, l = min(k, l), max(k, l)
+            self.p[l] = k
+            queue.append(l)
+
+    def coincidence(self, a, b):
+        T = self.table
+        queue = []
+        self.merge(a, b, queue)
+        i = 0
+        while i < len(queue):
+            e = queue[i]
+            i += 1
+            for x in range(self.n_cols):
+                f = T[e][x]
+                if f < 0:
+                    continue
+                T[f][x ^ 1] = -1
+                e1, f1 = self.rep(e), self.rep(f)
+                if T[e1][x] >= 0:
+                    self.merge(f1, T[e1][x], queue)
+                elif T[f1][x ^ 1] >= 0:
+                    self.merge(e1, T[f1][x ^ 1], queue)
+                else:
+                    T[e1][x] = f1
+                    T[f1][x ^ 1] = e1
+
+    # Trace the relator w (a list of columns) from the coset c forwards and
+    # backwards, defining new cosets until the cycle closes.
+    def scan_and_fill(self, c, w):
+        T = self.table
+        f, b = c, c
+        i, j = 0, len(w) - 1
+        while True:
+            while i <= j and T[f][w[i]] >= 0:
+                f = T[f][w[i]]
+                i += 1
+            if i > j:
+                if f != b:
+                    self.coincidence(f, b)
+                return
+            while j >= i and T[b][w[j] ^ 1] >= 0:
+                b = T[b][w[j] ^ 1]
+                j -= 1
+            if j < i:
+                self.coincidence(f, b)
+                return
+            if i == j:
+                T[f][w[i]] = b
+                T[b][w[i] ^ 1] = f
+                return
+            self.define(f, w[i])
+
+    def run(self, relators, subgroup):
+        for w in subgroup:
+            self.scan_and_fill(0, w)
+        c = 0
+        while c < len(self.table):
+            for w in relators:
+                if self.p[c] != c:
+                    break
+                self.scan_and_fill(c, w)
+            if self.p[c] == c:
+                for x in range(self.n_cols):
+                    if self.table[c][x] < 0:
+                        self.define(c, x)
+            c += 1
+
+    # The coset table on the live cosets, renumbered in increasing order.
+    def compressed(self):
+        live = [k for k in range(len(self.table)) if self.p[k] == k]
+        number = np.full(len(self.table), -1, dtype=np.int32)
+        number[live] = np.arange(len(live), dtype=np.int32)
+        T = np.array([self.table[k] for k in live], dtype=np.int64)
+        return number[T].astype(np.int32)
+
+
+# The coset table of the subgroup generated by the words in subgroup (strings or
+# parsed words) in the group given by the presentation P. The enumeration is
+# abandoned with a ValueError if more than max_cosets cosets are defined.
+def enumerate_cosets(P, subgroup=[], max_cosets=2**22):
+    relators = [_columns(w, P.gens) for w in P.words]
+    subgroup = [_columns(parse_word(w) if isinstance(w, str) else w, P.gens) for w in subgroup]
+    E = _Enumeration(2*len(P.gens), max_cosets)
+    E.run([w for w in relators if w], [w for w in subgroup if w])
+    return CosetTable(P.gens, E.compressed())
@@ -0,0 +1,147 @@
+"""Monster elements that remember their orders, powers, inverses and conjugates.
+
+An instance of Elt is an mmgroup element (a subclass of MM), so it can be used
+wherever an MM element can. In addition it keeps a small memo of derived
+quantities, so that e.g. in
+
+    h10 = Elt(a12**2*c5)
+    h10.order() == 10 and (h10**((h10**5).conjugate_involution()[1])).in_G_x0()
+
+the power h10**5 and its conjugate_involution() are computed once, however
+often they occur. Products, powers and conjugates of Elt instances are again
+Elt instances; in particular the inverses a**(-1) computed by Comm(a,b) are
+remembered. The memos of powers and conjugates are LRU caches of bounded size.
+"""
+
+from collections import OrderedDict
+from math import gcd
+from numbers import Integral
+
+from mmgroup import MM
+
+
+# the maximal number of powers and of conjugates remembered by an element
+MEMO_SIZE = 32
+
+
+def _remember(memo, key, value, size):
+    memo[key] = value
+    memo.move_to_end(key)
+    if len(memo) > size:
+        memo.popitem(last=False)
+    return value
+
+
+# An element that is already an instance of MM is passed on as it is (class MM
+# itself only accepts instances of MM, but not of its subclasses).
+def _to_mm(g):
+    return g if isinstance(g, MM) else MM.group._to_group(g)
+
+
+class Elt(MM):
+    def __init__(self, g, memo_size=MEMO_SIZE):
+        super().__init__(MM.group.copy_word(g) if isinstance(g, Elt) else g)
+        self._memo_size = memo_size
+        self._order = None
+        self._inverse = None
+        self._involution = None
+        self._powers = OrderedDict()
+        self._conjugates = OrderedDict()
+
+    # The order, or 0 if it exceeds max_order (which is not remembered, so that
+    # a later call with a larger max_order computes the order).
+    def order(self, max_order=119):
+        if self._order is None:
+            n = MM.order(self, max_order)
+            if n == 0:
+                return 0
+            self._order = n
+        return self._order
+
+    def inverse(self):
+        if self._inverse is None:
+            self._inverse = Elt(self.group._invert(self), self._memo_size)
+            self._inverse._inverse = self
+            self._inverse._order = self._order
+        return self._inverse
+
+    # The e-th power, built by repeated squaring from the remembered powers.
+    def power(self, e):
+        if self._order is not None:
+            e = e % self._order
+        if e == 1:
+            return self
+        if e < 0:
+            return self.inverse().power(-e)
+        if e in self._powers:
+            self._powers.move_to_end(e)
+            return self._powers[e]
+        if e == 0:
+            x = Elt(MM(), self._memo_size)
+        elif e % 2 == 0:
+            y = self.power(e // 2)
+            x = Elt(self.group._mul(y, y), self._memo_size)
+        else:
+            x = Elt(self.group._mul(self.power(e - 1), self), self._memo_size)
+        x.reduce()
+        if self._order is not None:
+            x._order = self._order // gcd(self._order, e)
+        return _remember(self._powers, e, x, self._memo_size)
+
+    # The conjugate h**-1 * self * h.
+    def conjugate(self, h):
+        key = tuple(h.as_tuples())
+        if key in self._conjugates:
+            self._conjugates.move_to_end(key)
+            return self._conjugates[key]
+        h_inv = h.inverse() if isinstance(h, Elt) else self.group._invert(h)
+        x = Elt(self.group._mul(self.group._mul(h_inv, self), h), self._memo_size)
+        x._order = self._order
+        return _remember(self._conjugates, key, x, self._memo_size)
+
+    def conjugate_involution(self, *args, **kwds):
+        if args or kwds:
+            return MM.conjugate_involution(self, *args, **kwds)
+        if self._involution is None:
+            self._involution = MM.conjugate_involution(self)
+        return self._involution
+
+    def __pow__(self, exp):
+        if isinstance(exp, Integral):
+            return self.power(exp)
+        if isinstance(exp, MM):
+            return self.conjugate(exp)
+        return NotImplemented
+
+    # conjugation of an mmgroup element g by an Elt h, i.e. g**h
+    def __rpow__(self, g):
+        g = _to_mm(g)
+        return Elt(self.group._mul(self.group._mul(self.inverse(), g), self), self._memo_size)
+
+    def __mul__(self, other):
+        if isinstance(other, Integral) and other == 1:
+            return self
+        return Elt(self.group._mul(self, _to_mm(other)), self._memo_size)
+
+    def __rmul__(self, other):
+        if isinstance(other, Integral) and other == 1:
+            return self
+        return Elt(self.group._mul(_to_mm(other), self), self._memo_size)
+
+    def __eq__(self, other):
+        try:
+            other = _to_mm(other)
+        except TypeError:
+            return NotImplemented
+        return self.group._equal_words(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+
+# Check that g has order exactly n. For an Elt the order is remembered, so it is
+# computed at most once.
+def has_order(g, n):
+    return g.order(max(n, 119)) == n
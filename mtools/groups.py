@@ -0,0 +1,117 @@
+"""Constructing subgroups of the Monster from generating sets."""
+
+import itertools
+import time
+
+from .checkpoint import Checkpoint, pack, unpack
+
+
+# The breadth-first search of group_generated_by: the list orb (with the set
+# orbset of the keys of its elements) is closed under right multiplication by
+# the elements of L, starting from orb[j]. After each element orb[j] has been
+# processed, the position j+1 of the next one is yielded, so that the caller can
+# inspect the new elements at the end of orb, or stop the search.
+def _closure(L, orb, orbset, j):
+    while j < len(orb):
+        for g in L:
+            el= orb[j]*g
+            eltup = tuple(el.as_tuples())
+            if not eltup in orbset:
+                orb.append(el)
+                orbset.add(eltup)
+        j = j+1
+        yield j
+
+
+# A function that constructs a subgroup of M from a generating set.
+# * The input L is a list of mmgroup elements; the function returns a list of
+#   the elements comprising the subgroup of M generated by L.
+# * The input n is a 'desired' upper bound on the order of the subgroup
+#   generated by L; if more elements are found, then the function aborts.
+# * If the optional argument order_only is set to True, then the function only
+#   returns the order of the subgroup generated by L (and not the elements).
+# * If the optional argument verbose is set to False, then no progress is printed.
+# * If the optional argument resume is a file name, then a snapshot of the
+#   computation is written to that file every checkpoint_interval seconds (see
+#   mtools/checkpoint.py); calling the function again with the same L and resume
+#   continues from the last snapshot, with the same result as an uninterrupted run.
+def group_generated_by(L, n, order_only=False, verbose=True, resume=None, checkpoint_interval=60):
+    start = end = time.time()
+    checkpoint = None
+    state = None
+    if resume is not None:
+        checkpoint = Checkpoint(resume, [tuple(g.as_tuples()) for g in L], checkpoint_interval)
+        state = checkpoint.load()
+    if state is not None:
+        orb, j = unpack(state[0]), state[1]
+        orbset = {tuple(el.as_tuples()) for el in orb}
+        os = len(orb)-1
+    else:
+        orb = [L[0]]
+        orbset = {tuple(L[0].as_tuples())}
+        os = 0
+        for el in L:
+            eltup = tuple(el.as_tuples())
+            if not eltup in orbset:
+                orb.append(el)
+                orbset.add(eltup)
+                os = os+1;
+             
+        j = 0
+    for j in _closure(L, orb, orbset, j):
+        os = len(orb)-1
+        if checkpoint is not None:
+            checkpoint.save(lambda: (pack(orb), j))
+        end = time.time()       
+        if verbose:
+            print("Limit", n, "; have", os, "in time ", round(end-start,4), end='\r')
+        if len(orbset)>n:
+            if verbose:
+                print("Group is larger than imposed limit -- abort in time ", round(end-start,4) )
+            return False
+    
+    if checkpoint is not None:
+        checkpoint.save((pack(orb), j), force=True)
+    if verbose:
+        print("Limit", n, "; have", len(orb), "in time ", round(end-start,4), end='\r')
+    if order_only:
+        return len(orb)
+    return orb
+
+
+# The elements of the subgroup of M generated by the list L, as a generator, in
+# the order of the list returned by group_generated_by: first the elements of L
+# (without repetitions), then each element as soon as the search finds it. If
+# batch_size is given, lists of batch_size new elements are yielded instead (the
+# last one may be shorter).
+# The search only runs as far as the consumer requests elements, so e.g. a search
+# for an element with some property can stop at the first one, and
+#   itertools.islice(iter_group_generated_by(L), n+1)
+# gives at most n+1 elements, i.e. more than n if the group is larger than n.
+def iter_group_generated_by(L, batch_size=None):
+    orb, orbset = [], set()
+    for el in L:
+        eltup = tuple(el.as_tuples())
+        if not eltup in orbset:
+            orb.append(el)
+            orbset.add(eltup)
+    done = 0
+    for j in itertools.chain([0], _closure(L, orb, orbset, 0)):
+        if batch_size is None:
+            while done < len(orb):
+                yield orb[done]
+                done += 1
+        else:
+            while len(orb) - done >= batch_size:
+                yield orb[done:done+batch_size]
+                done += batch_size
+    if batch_size is not None and done < len(orb):
+        yield orb[done:]
+
+
+# The order of the subgroup of M generated by L if it is at most n, and False
+# otherwise; as group_generated_by(L, n, order_only=True), but the search stops
+# as soon as more than n elements have been found.
+def group_order_up_to(L, n):
+    k = sum(1 for el in itertools.islice(iter_group_generated_by(L), n+1))
+    return k if k <= n else False
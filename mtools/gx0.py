@@ -0,0 +1,176 @@
+"""Elements of G_x0 = 2^{1+24}.Co_1 in mmgroup's internal representation of G_x0.
+
+Many elements in the proofs lie in the subgroup G_x0 of the Monster (e.g. the
+standard generators of G, the elements of type G in Section 5, g7 and the e_i
+in Section 7). mmgroup's class Xsp2_Co1 represents such an element by its
+action on 2^{1+24} and on the Leech lattice mod 2, so that products, powers,
+orders and chi_G_x0() are computed without the general word machinery of MM.
+
+A GElt holds the internal data of an Xsp2_Co1 element (a NumPy array of 26
+integers) and multiplies, inverts and powers it with the C functions of mmgroup
+directly, avoiding the overhead of the Python classes; an Xsp2_Co1 (or MM)
+object is only built for chi_G_x0() and the like. Products, powers and
+conjugates of GElt instances (and of mmgroup elements in G_x0) are again GElt instances; as soon as
+an operand does not lie in G_x0, the result is an ordinary MM element. The
+function gx0 converts an mmgroup element to a GElt if it lies in G_x0, and
+leaves it unchanged otherwise. GX0_OPS is the corresponding backend for SLPs
+and presentations (see mtools/slp.py).
+
+Note that Xsp2_Co1 does not check its input: an element outside G_x0 must not be
+converted, which GElt and gx0 ensure via MM.in_G_x0().
+"""
+
+from numbers import Integral
+
+import numpy as np
+
+from mmgroup import MM, Xsp2_Co1
+from mmgroup.clifford12 import chk_qstate12, xsp2co1_inv_elem, xsp2co1_is_unit_elem
+from mmgroup.clifford12 import xsp2co1_mul_elem, xsp2co1_order_elem, xsp2co1_power_elem
+from mmgroup.clifford12 import xsp2co1_reduce_elem
+
+
+def _new():
+    return np.zeros(26, dtype=np.uint64)
+
+
+class GElt:
+    __slots__ = ("data",)
+
+    # g is an mmgroup element in G_x0 (or an Xsp2_Co1 element or a GElt); data
+    # may instead be given directly.
+    def __init__(self, g=None, data=None):
+        if data is None:
+            if isinstance(g, GElt):
+                data = g.data
+            else:
+                if not isinstance(g, Xsp2_Co1):
+                    g = g if isinstance(g, MM) else MM(g)
+                    if not g.in_G_x0():
+                        raise ValueError("The element does not lie in G_x0")
+                    g = Xsp2_Co1(g)
+                data = g._data
+            data = data.copy()
+        self.data = data
+
+    def __repr__(self):
+        return "GElt(%s)" % self.mm()
+
+    # The element as an Xsp2_Co1 element, and as an mmgroup element of the Monster.
+    @property
+    def x(self):
+        g = Xsp2_Co1()
+        g._data[:] = self.data
+        return g
+
+    def mm(self):
+        return MM(self.x)
+
+    def as_tuples(self):
+        return self.mm().as_tuples()
+
+    def in_G_x0(self):
+        return True
+
+    def in_Q_x0(self):
+        return self.mm().in_Q_x0()
+
+    def order(self):
+        return chk_qstate12(xsp2co1_order_elem(self.data))
+
+    def is_one(self):
+        return bool(xsp2co1_is_unit_elem(self.data))
+
+    def inverse(self):
+        w = _new()
+        chk_qstate12(xsp2co1_inv_elem(self.data, w))
+        return GElt(data=w)
+
+    def power(self, e):
+        w = _new()
+        chk_qstate12(xsp2co1_power_elem(self.data, e, w))
+        return GElt(data=w)
+
+    def chi_G_x0(self):
+        return self.x.chi_G_x0()
+
+    def conjugate_involution(self, *args, **kwds):
+        return self.mm().conjugate_involution(*args, **kwds)
+
+    # The image in Co_1, as the 24 x 24 matrix over GF(2) acting on the Leech
+    # lattice mod 2 (in the convention of elt_to_24_mat in maximals_of_M.py).
+    def co1_matrix(self):
+        return np.array(self.x.as_Co1_bitmatrix(), dtype=np.int64)[::-1, ::-1]
+
+    def __mul__(self, other):
+        if isinstance(other, Integral) and other == 1:
+            return self
+        other = gx0(other)
+        if isinstance(other, GElt):
+            return _mul(self, other)
+        return self.mm() * other
+
+    def __rmul__(self, other):
+        if isinstance(other, Integral) and other == 1:
+            return self
+        other = gx0(other)
+        if isinstance(other, GElt):
+            return _mul(other, self)
+        return other * self.mm()
+
+    def __pow__(self, exp):
+        if isinstance(exp, Integral):
+            return self.power(exp)
+        exp = gx0(exp)
+        if isinstance(exp, GElt):
+            return _mul(_mul(exp.inverse(), self), exp)
+        return self.mm()**exp
+
+    # conjugation of an mmgroup element g by a GElt h, i.e. g**h
+    def __rpow__(self, g):
+        g = gx0(g)
+        if isinstance(g, GElt):
+            return _mul(_mul(self.inverse(), g), self)
+        return g**self.mm()
+
+    def __eq__(self, other):
+        if isinstance(other, GElt):
+            chk_qstate12(xsp2co1_reduce_elem(self.data))
+            chk_qstate12(xsp2co1_reduce_elem(other.data))
+            return bool((self.data == other.data).all())
+        if isinstance(other, MM):
+            return self.mm() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+
+def _mul(g, h):
+    w = _new()
+    chk_qstate12(xsp2co1_mul_elem(g.data, h.data, w))
+    return GElt(data=w)
+
+
+# The mmgroup element g as a GElt if it lies in G_x0, and unchanged otherwise.
+def gx0(g):
+    if isinstance(g, GElt):
+        return g
+    g = g if isinstance(g, MM) else MM(g)
+    return GElt(g) if g.in_G_x0() else g
+
+
+# Backend for SLPs and presentations on GElt instances (see mtools/slp.py).
+class _GX0Ops:
+    def mul(self, x, y):
+        return x*y
+    def inv(self, x):
+        return x**-1
+    def is_one(self, x):
+        return x.is_one()
+    def pow(self, x, e):
+        return x**e
+
+GX0_OPS = _GX0Ops()
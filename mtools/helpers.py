@@ -0,0 +1,145 @@
+"""The general helper functions of the notebooks, importable without running them.
+
+maximals_of_M.py and other_gens.py are exports of the notebooks, so importing
+them runs every cell, including computations that take hours. This module holds
+their general helpers (Comm, elt_to_24_mat, get_random, trace_mod_3 with its
+parts partial_trace_mod_3 and chunk_trace_mod_3, vector_to_integer and
+integer_to_element), so that other scripts, and job workers on other hosts (see
+mtools/jobs.py), can import them. group_generated_by, iter_group_generated_by
+and group_order_up_to (from mtools/groups.py) are available here as well.
+
+Importing this module is cheap: mmgroup, NumPy, multiprocessing and the other
+modules of mtools are only imported by the functions that need them, and the
+functions from mtools/groups.py are loaded on first access. import_time()
+measures the time of the import in a fresh interpreter, which should stay below
+IMPORT_BUDGET seconds.
+"""
+
+
+IMPORT_BUDGET = 0.05
+
+_GROUPS = ("group_generated_by", "iter_group_generated_by", "group_order_up_to")
+
+
+def __getattr__(name):
+    if name in _GROUPS:
+        from . import groups
+        return getattr(groups, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+# The group commutator [a,b] = a^-1 b^-1 a b.
+def Comm(a,b):
+   return a**(-1)*b**(-1)*a*b
+
+
+# The image of the element g of G_x0 in Co_1, as a 24 x 24 matrix over GF(2)
+# (a list of rows) acting on the Leech lattice mod 2.
+def elt_to_24_mat(g):
+   from mmgroup import generators
+   mat = []
+   for i in range(24):
+       x = generators.gen_leech2_op_word_leech2(2**(23-i),g.mmdata,len(g.mmdata),0)
+       mat.append([int(d) for d in format((x %2**24), '#026b')[2:]])
+   return mat
+
+
+# The product replacement algorithm: performs n product replacement steps on the
+# list L of mmgroup elements (in place!) and returns the last element changed; if
+# init_already is False, L is first extended by 6 random entries and 200 steps
+# are performed, regardless of n.
+def get_random(L, n=1, init_already=True):
+    import random
+    i = 0
+    if init_already == False:
+        for i in range(6):
+            L.append(random.choice(L))
+        return get_random(L,200)
+    while i<n:
+        a = random.choice(range(0,len(L)))
+        b = a
+        while b == a:
+            b = random.choice(range(0,len(L)))
+        if random.choice([0,1]):
+            L[a] = L[a]*L[b]
+        else:
+            L[a] = L[b]*L[a]
+        i = i+1
+    return L[a]
+
+
+# The reducible M-module V of dimension 196884 over the field of order 3, created
+# on first use.
+_V = None
+
+def _module_mod_3():
+    global _V
+    if _V is None:
+        from mmgroup import MMV
+        _V = MMV(3)
+    return _V
+
+# The sum of the diagonal entries of g on the basis vectors start, ..., end-1 of V.
+def partial_trace_mod_3(start, end, g):
+    V = _module_mod_3()
+    return sum([int((V([('E', i)]) * g)['E'][i]) % 3 for i in range(start, end)])
+
+# partial_trace_mod_3 for a chunk (start, end) of the basis of V.
+def chunk_trace_mod_3(args):
+    (start, end), g = args
+    return (start, end), partial_trace_mod_3(start, end, g)
+
+# The trace of g acting on V, modulo 3;
+# the basis of V is split into n_chunks chunks (by default one for each process), and if resume is
+# a file name, the partial traces of the finished chunks are saved there, so that only the missing
+# chunks are computed when the function is called again with the same arguments;
+# if address is given, the chunks are served by a job coordinator at that address (see
+# mtools/jobs.py), so that workers on other hosts can join the n_processes local ones;
+# authkey is the secret key of the coordinator (by default the one in MTOOLS_AUTHKEY)
+def trace_mod_3(g, n_processes=1, resume=None, n_chunks=None, address=None, authkey=None):
+    n_chunks = n_processes if n_chunks is None else n_chunks
+    chunk_size = 196884 // n_chunks
+    start_indices = [i * chunk_size for i in range(n_chunks)]
+    end_indices = [(start + chunk_size) if i < n_chunks - 1 else 196884 for i, start in enumerate(start_indices)]
+    chunks = list(zip(start_indices, end_indices))
+    results, checkpoint = {}, None
+    if resume is not None:
+        from .checkpoint import Checkpoint
+        checkpoint = Checkpoint(resume, (g.as_tuples(), chunks), interval=0)
+        results = checkpoint.load() or {}
+    todo = [(chunk, g) for chunk in chunks if not chunk in results]
+    def add(chunk, result):
+        results[chunk] = result
+        if checkpoint is not None:
+            checkpoint.save(results)
+    if address is not None:
+        from .jobs import run_jobs
+        run_jobs(chunk_trace_mod_3, todo, n_processes, address, authkey, on_result=lambda i, r: add(*r))
+    else:
+        import multiprocessing as mp
+        with mp.Pool(n_processes) as pool:
+            for chunk, result in pool.imap_unordered(chunk_trace_mod_3, todo):
+                add(chunk, result)
+    return sum(results.values()) %3
+
+
+# The vector v in GF(2)^24 (a sequence of 24 bits, most significant first) as an
+# integer, and the element of Q_x0 given by such an integer.
+def vector_to_integer(v):
+    return sum([2**(23-i)*v[i] for i in range(24)])
+
+def integer_to_element(x):
+    from mmgroup import MM, XLeech2
+    return MM(XLeech2(x))
+
+
+# The time in seconds of "import module" in a fresh interpreter, the minimum over
+# repeat runs (run from the directory containing mtools).
+def import_time(module="mtools.helpers", repeat=5):
+    import os
+    import subprocess
+    import sys
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import time; t = time.perf_counter(); import %s; print(time.perf_counter() - t)" % module
+    return min(float(subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True,
+                                    text=True, check=True).stdout) for k in range(repeat))
@@ -0,0 +1,118 @@
+"""Batch tests on involutions of the Monster.
+
+classify_involutions computes conjugate_involution() for a list of involutions,
+testing each distinct involution once (possibly in worker processes). The
+results can be kept in an InvolutionCache on disk, so that involutions seen in
+earlier runs or other sections are not classified again.
+"""
+
+import multiprocessing as mp
+
+from mmgroup import MM
+
+from .checkpoint import Checkpoint
+from .groups import group_order_up_to
+
+
+# the central involution of G = 2^{1+24}.Co_1, generating Z(Q)
+z = MM("M<x_1000h>")
+
+
+# Necessary condition for <g7,x> = 2^3:7 with x an involution: x lies in the
+# normal 2^3, so it commutes with its conjugates under <g7>. Up to conjugation
+# the pairs {x^(g7^i), x^(g7^j)} are covered by the differences i-j = 1, 2, 3.
+# Two involutions commute if and only if their product has order at most 2.
+def _commutes_with_g7_conjugates(g7, x):
+    return all((x*x**(g7**i)).order() <= 2 for i in [1,2,3])
+
+
+# The test from the proof of Proposition 7.2 for both elements of the coset xZ(Q),
+# where x lies in Q but not in Z(Q). Such x is conjugate to x*z inside Q, so both
+# coset elements have the same order and class; and x*z commutes with its
+# conjugates under g7 if and only if x does. Only the final (expensive) check on
+# the order of <g7,x> has to be run separately for x and x*z.
+def _good_2B_coset(g7, x):
+    if x.order() != 2:
+        return []
+    if not _commutes_with_g7_conjugates(g7, x):
+        return []
+    if x.conjugate_involution()[0] != 2:
+        return []
+    return [y for y in [x, x*z] if group_order_up_to([g7,y], 56) == 56]
+
+
+# Returns the elements y of the cosets xZ(Q), for x in the list L of elements of
+# Q \ Z(Q), such that y is a 2B-involution and <g7,y> has order 56.
+# The cosets are distributed over n_processes worker processes; the output is
+# in the same order as the loop over L in the proof of Proposition 7.2.
+def filter_good_2B(g7, L, n_processes=1):
+    if n_processes == 1:
+        results = [_good_2B_coset(g7, x) for x in L]
+    else:
+        with mp.Pool(n_processes) as pool:
+            results = pool.starmap(_good_2B_coset, [(g7, x) for x in L])
+    return [y for ys in results for y in ys]
+
+
+def _key(x):
+    return tuple(x.as_tuples())
+
+
+# The class (1 for 2A, 2 for 2B) of the involution x and an element h such that
+# x**h is the central involution z of G_x0 (for 2B), as in conjugate_involution();
+# h is returned as its internal data, which is cheaper to send between processes.
+def _conjugate_involution(x):
+    k, h = x.conjugate_involution()
+    return k, h.mmdata
+
+
+class InvolutionCache:
+    # The results of conjugate_involution(), keyed by the words (as_tuples()) of
+    # the involutions. If path is given, the cache is read from and written to it.
+    def __init__(self, path=None):
+        self.checkpoint = None if path is None else Checkpoint(path, key="conjugate_involution", interval=0)
+        state = None if self.checkpoint is None else self.checkpoint.load()
+        self.results = {} if state is None else state
+
+    def __len__(self):
+        return len(self.results)
+
+    def __contains__(self, x):
+        return _key(x) in self.results
+
+    def __getitem__(self, x):
+        k, data = self.results[_key(x)]
+        h = MM('a', data)
+        h.reduced = True
+        return k, h
+
+    def update(self, results):
+        self.results.update(results)
+
+    def save(self):
+        if self.checkpoint is not None:
+            self.checkpoint.save(self.results, force=True)
+
+
+# Returns the list of pairs (class, conjugator) as returned by conjugate_involution()
+# for the involutions in the list L. Each distinct involution is classified once;
+# those not in the cache (an InvolutionCache, or the path of its file) are
+# distributed over n_processes worker processes and then added to the cache.
+def classify_involutions(L, n_processes=1, cache=None):
+    if not isinstance(cache, InvolutionCache):
+        cache = InvolutionCache(cache)
+    new = {}
+    for x in L:
+        key = _key(x)
+        if not key in cache.results and not key in new:
+            new[key] = x
+    if new:
+        todo = list(new.values())
+        if n_processes == 1:
+            results = [_conjugate_involution(x) for x in todo]
+        else:
+            with mp.Pool(n_processes) as pool:
+                results = pool.map(_conjugate_involution, todo)
+        cache.update(zip(new, results))
+        cache.save()
+    return [cache[x] for x in L]
@@ -0,0 +1,306 @@
+"""Distributing independent work units over processes on several hosts.
+
+A Coordinator holds a function and a list of work units (e.g. seed ranges,
+ranges of basis indices, or sub-cubes of an enumeration) and serves them over
+TCP with multiprocessing.managers, from a server process of its own. Workers
+(run_worker, on any host that can reach the coordinator and import the
+function) repeatedly fetch a unit, apply the function to it and send back the
+result. A unit handed out but not returned within lease seconds (e.g. because
+its worker died) is handed out again; a result is only kept once. If the
+function raises an exception, the worker sends it back instead of a result, and
+the coordinator raises it again.
+
+run_jobs is the local stand-in: it starts a coordinator on localhost and a
+number of worker processes on the same machine, and returns the results in the
+order of the units. More workers can join from other hosts via the address of
+the coordinator, e.g.
+
+    # on each host, with the same secret
+    export MTOOLS_AUTHKEY=...        # e.g. the output of new_authkey()
+    # on the coordinating host
+    with Coordinator(f, units, address=("", 50000)) as c:
+        for i, result in c.results():
+            ...
+    # on each other host
+    run_worker(("coordinator.host", 50000), n_processes=8)
+
+The function is sent to the workers by name (module and qualified name), so on
+other hosts it must be importable, i.e. not defined in a notebook.
+
+The connection is authenticated with a secret key, but not encrypted. Since the
+server and the workers unpickle what they receive, anyone knowing the key can
+run code on them, so the key must be kept secret. It is given as the argument
+authkey or in the environment variable MTOOLS_AUTHKEY; a coordinator on a
+loopback address without a key uses a random one (which run_jobs passes on to
+its local workers), and a coordinator on any other address requires a key.
+"""
+
+import collections
+import importlib
+import ipaddress
+import multiprocessing as mp
+import os
+import threading
+import time
+import traceback
+from multiprocessing.managers import BaseManager
+
+
+AUTHKEY_VARIABLE = "MTOOLS_AUTHKEY"
+
+
+# A new random secret key, as printable bytes (e.g. for MTOOLS_AUTHKEY).
+def new_authkey():
+    return os.urandom(32).hex().encode()
+
+def _is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+# The key given, or else the one in MTOOLS_AUTHKEY; if there is neither, a
+# random one for a coordinator on a loopback address (if new is True), and an
+# error otherwise.
+def _authkey(authkey, address, new=False):
+    if authkey is None and os.environ.get(AUTHKEY_VARIABLE):
+        authkey = os.environ[AUTHKEY_VARIABLE].encode()
+    if authkey is None:
+        if new and _is_loopback(address[0]):
+            return new_authkey()
+        raise ValueError("No authkey for %s:%d; pass authkey or set %s" % (address + (AUTHKEY_VARIABLE,)))
+    return authkey if isinstance(authkey, bytes) else authkey.encode()
+
+
+# The name of the function fn as "module:qualified name", and back.
+def _name(fn):
+    return "%s:%s" % (fn.__module__, fn.__qualname__)
+
+def _resolve(name):
+    module, qualname = name.split(":")
+    fn = importlib.import_module(module)
+    for attr in qualname.split("."):
+        fn = getattr(fn, attr)
+    return fn
+
+
+# The state of the coordinator, in its server process; its methods are called
+# by the workers and by the Coordinator (in the threads of the server), so they
+# are serialised by a lock.
+class _Jobs:
+    def __init__(self, name, units, lease):
+        self.name = name
+        self.units = units
+        self.lease = lease
+        self.todo = collections.deque(range(len(units)))
+        self.leased = {}
+        self.results = {}
+        self.new = []
+        self.error = None
+        self.lock = threading.Lock()
+
+    def function(self):
+        return self.name
+
+    # The next unit as a pair (index, unit); (-1, None) if all units are handed
+    # out but not all results are in, and None if all results are in.
+    def get(self):
+        with self.lock:
+            now = time.time()
+            for i, t in list(self.leased.items()):
+                if now - t > self.lease:
+                    del self.leased[i]
+                    self.todo.append(i)
+            while self.todo:
+                i = self.todo.popleft()
+                if not i in self.results:
+                    self.leased[i] = now
+                    return i, self.units[i]
+            return None if len(self.results) == len(self.units) else (-1, None)
+
+    def put(self, i, result):
+        with self.lock:
+            self.leased.pop(i, None)
+            if not i in self.results:
+                self.results[i] = result
+                self.new.append(i)
+
+    # The exception error (with the formatted traceback tb) raised by the
+    # function on the unit with index i; only the first one is kept.
+    def fail(self, i, error, tb):
+        with self.lock:
+            self.leased.pop(i, None)
+            if self.error is None:
+                self.error = (i, error, tb)
+
+    # The pairs (index, result) that arrived since the last call.
+    def collect(self):
+        with self.lock:
+            new, self.new = self.new, []
+            return [(i, self.results[i]) for i in new]
+
+    # The triple (index, exception, traceback) of the first failed unit, or None.
+    def failure(self):
+        with self.lock:
+            return self.error
+
+    def status(self):
+        with self.lock:
+            return {"units": len(self.units), "done": len(self.results), "leased": len(self.leased)}
+
+
+# The _Jobs instance of the server process, created by _start_jobs when the
+# server starts.
+_JOBS = None
+
+def _start_jobs(name, units, lease):
+    global _JOBS
+    _JOBS = _Jobs(name, units, lease)
+
+def _get_jobs():
+    return _JOBS
+
+class _Manager(BaseManager):
+    pass
+
+_Manager.register("jobs", callable=_get_jobs)
+
+
+class Coordinator:
+    # Serve the units (a list of picklable objects) for the function fn at the
+    # given address; port 0 chooses a free port, see the attribute address. For
+    # authkey see the module docstring.
+    def __init__(self, fn, units, address=("127.0.0.1", 0), authkey=None, lease=3600):
+        units = list(units)
+        self.n_units = len(units)
+        self.authkey = _authkey(authkey, address, new=True)
+        self._manager = _Manager(address=address, authkey=self.authkey)
+        self._manager.start(_start_jobs, (_name(fn), units, lease))
+        self.address = self._manager.address
+        self._jobs = self._manager.jobs()
+
+    def __repr__(self):
+        return "<Coordinator at %s:%d: %r>" % (self.address + (self._jobs.status(),))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    # The pairs (index, result), as they arrive, until all results are in; the
+    # exception of a failed unit is raised again. If alive is given, it is called
+    # while no results arrive, and if it returns False (e.g. because all workers
+    # have exited), a RuntimeError is raised.
+    def results(self, poll=0.5, alive=None):
+        n = 0
+        while n < self.n_units:
+            new = self._jobs.collect()
+            if not new:
+                self._raise_failure()
+                if alive is not None and not alive():
+                    new = self._jobs.collect()
+                    if not new:
+                        self._raise_failure()
+                        raise RuntimeError("The workers exited with %d of %d results missing"
+                                           % (self.n_units - n, self.n_units))
+                else:
+                    time.sleep(poll)
+            for r in new:
+                n += 1
+                yield r
+
+    def _raise_failure(self):
+        failure = self._jobs.failure()
+        if failure is not None:
+            i, error, tb = failure
+            raise error from _RemoteTraceback("Unit %d failed in a worker:\n%s" % (i, tb))
+
+    def status(self):
+        return self._jobs.status()
+
+    def shutdown(self):
+        self._manager.shutdown()
+
+
+# The traceback of an exception raised in a worker, as the cause of the exception.
+class _RemoteTraceback(Exception):
+    pass
+
+
+class _Client(BaseManager):
+    pass
+
+_Client.register("jobs")
+
+def _connect(address, authkey):
+    m = _Client(address=address, authkey=authkey)
+    m.connect()
+    return m.jobs()
+
+# Work on the units of the coordinator at address until none are left (or the
+# coordinator is gone); returns the number of units done. An exception raised by
+# the function is sent to the coordinator (as a RuntimeError with its repr if it
+# cannot be pickled).
+def _work(address, authkey, poll=0.2):
+    n = 0
+    try:
+        jobs = _connect(address, authkey)
+        fn = _resolve(jobs.function())
+        while True:
+            job = jobs.get()
+            if job is None:
+                return n
+            i, unit = job
+            if i < 0:
+                time.sleep(poll)
+                continue
+            try:
+                result = fn(unit)
+            except Exception as e:
+                tb = traceback.format_exc()
+                try:
+                    jobs.fail(i, e, tb)
+                except (EOFError, ConnectionError):
+                    raise
+                except Exception:
+                    jobs.fail(i, RuntimeError(repr(e)), tb)
+                continue
+            jobs.put(i, result)
+            n += 1
+    except (EOFError, ConnectionError):
+        return n
+
+
+# Run n_processes workers for the coordinator at address on this host; authkey
+# is the key of the coordinator (by default the one in MTOOLS_AUTHKEY).
+def run_worker(address, authkey=None, n_processes=1):
+    authkey = _authkey(authkey, address)
+    if n_processes == 1:
+        return _work(address, authkey)
+    with mp.Pool(n_processes) as pool:
+        return sum(pool.starmap(_work, [(address, authkey)] * n_processes))
+
+
+# The list [fn(unit) for unit in units], computed by n_processes local workers of
+# a coordinator at address (by default on localhost, at a free port). If
+# on_result is given, on_result(index, result) is called for each result as it
+# arrives (e.g. to save a checkpoint). An exception raised by fn is raised again,
+# and a RuntimeError is raised if all local workers exit before all results are in.
+def run_jobs(fn, units, n_processes=1, address=("127.0.0.1", 0), authkey=None, on_result=None):
+    units = list(units)
+    results = [None] * len(units)
+    with Coordinator(fn, units, address, authkey) as c:
+        workers = [mp.Process(target=_work, args=(c.address, c.authkey), daemon=True) for k in range(n_processes)]
+        for w in workers:
+            w.start()
+        alive = (lambda: any(w.is_alive() for w in workers)) if workers else None
+        for i, result in c.results(alive=alive):
+            results[i] = result
+            if on_result is not None:
+                on_result(i, result)
+        for w in workers:
+            w.join()
+    return results
@@ -0,0 +1,172 @@
+"""Lazily evaluated expressions in elements of the Monster.
+
+A Lazy element records how it was built from mmgroup elements (products,
+inverses, powers and conjugates) instead of computing it. Products are stored
+flattened, as the list of their factors, and inverses of products as products
+of inverses, so e.g. Comm(x, y) = x**-1*y**-1*x*y becomes a single product of
+four factors. Nodes are shared: building the same expression twice, e.g. a*b
+in ((a*b)**3*(a*b**2)*(a*b)*(a*b**2)**2)**23, gives the same node, whose value
+is computed once.
+
+The value (an mmgroup element) is only computed when it is needed, i.e. for
+comparisons, order(), chi_G_x0(), conjugate_involution() and the like, or by
+calling value(). The factors of a product are then concatenated as words, in
+pairs, then the pairs in pairs, and so on (rather than from left to right, which
+copies the growing word once for each factor), and a word is only reduced by
+mmgroup when it becomes long or when the value is needed; powers are computed
+from the reduced value of their base.
+
+Comparisons with an mmgroup element on the left, e.g. in "x in [y, y**2]", are
+done by MM, which does not know Lazy elements; use x.value() there.
+"""
+
+import weakref
+from numbers import Integral
+
+from mmgroup import MM
+
+
+# The nodes by their keys; a node is forgotten when it is no longer referenced.
+_NODES = weakref.WeakValueDictionary()
+
+
+def _node(op, args):
+    key = (op,) + tuple(a if isinstance(a, Integral) else id(a) for a in args)
+    node = _NODES.get(key)
+    if node is None:
+        node = Lazy(_op=op, _args=args)
+        _NODES[key] = node
+    return node
+
+
+class Lazy:
+    # A leaf holding the mmgroup element g; nodes are built by the operations
+    # below (the keyword arguments are internal).
+    def __init__(self, g=None, _op="leaf", _args=None):
+        self.op = _op
+        self.args = (g,) if _op == "leaf" else _args
+        self._value = g if _op == "leaf" else None
+
+    def __repr__(self):
+        return "<Lazy %s>" % self.op
+
+    # The factors of a product, as a tuple of nodes that are not products.
+    def factors(self):
+        return self.args if self.op == "mul" else (self,)
+
+    # The value of the node, as an mmgroup element (reduced if reduce is True).
+    def value(self, reduce=True):
+        if self._value is None:
+            if self.op == "mul":
+                w = _balanced_product([f.value(False) for f in self.args])
+            elif self.op == "inv":
+                w = self.args[0].value(False)**-1
+            else:
+                w = self.args[0].value()**self.args[1]
+            self._value = w
+        if reduce:
+            self._value.reduce()
+        return self._value
+
+    def reduce(self):
+        self.value()
+        return self
+
+    def inverse(self):
+        if self.op == "mul":
+            return _product([f.inverse() for f in reversed(self.args)])
+        if self.op == "inv":
+            return self.args[0]
+        if self.op == "pow":
+            return self.args[0].power(-self.args[1])
+        return _node("inv", (self,))
+
+    def power(self, e):
+        if e == 1:
+            return self
+        if e == 0:
+            return lazy(MM())
+        if self.op == "pow":
+            return self.args[0].power(self.args[1] * e)
+        if e == -1:
+            return self.inverse()
+        return _node("pow", (self, e))
+
+    def __mul__(self, other):
+        if isinstance(other, Integral) and other == 1:
+            return self
+        return _product([self, lazy(other)])
+
+    def __rmul__(self, other):
+        if isinstance(other, Integral) and other == 1:
+            return self
+        return _product([lazy(other), self])
+
+    def __pow__(self, exp):
+        if isinstance(exp, Integral):
+            return self.power(exp)
+        h = lazy(exp)
+        return _product([h.inverse(), self, h])
+
+    # conjugation of an mmgroup element g by a Lazy h, i.e. g**h
+    def __rpow__(self, g):
+        return _product([self.inverse(), lazy(g), self])
+
+    def __eq__(self, other):
+        if isinstance(other, (Lazy, MM)):
+            return self.value() == lazy(other).value()
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def order(self, *args):
+        return self.value().order(*args)
+
+    def as_tuples(self):
+        return self.value().as_tuples()
+
+    def in_G_x0(self):
+        return self.value().in_G_x0()
+
+    def in_Q_x0(self):
+        return self.value().in_Q_x0()
+
+    def chi_G_x0(self):
+        return self.value().chi_G_x0()
+
+    def conjugate_involution(self, *args, **kwds):
+        return self.value().conjugate_involution(*args, **kwds)
+
+
+# The product of the mmgroup elements in the list words (which are not changed),
+# multiplied in pairs, then the pairs in pairs, and so on.
+def _balanced_product(words):
+    while len(words) > 1:
+        words = [words[i] * words[i+1] if i + 1 < len(words) else words[i]
+                 for i in range(0, len(words), 2)]
+    return words[0]
+
+
+def _product(nodes):
+    factors = [f for n in nodes for f in n.factors()]
+    if not factors:
+        return lazy(MM())
+    if len(factors) == 1:
+        return factors[0]
+    return _node("mul", tuple(factors))
+
+
+# The mmgroup element g as a Lazy element (a Lazy element is returned unchanged);
+# the same element gives the same leaf, as long as that is referenced.
+def lazy(g):
+    if isinstance(g, Lazy):
+        return g
+    g = g if isinstance(g, MM) else MM(g)
+    leaf = _NODES.get(("leaf", id(g)))
+    if leaf is None or leaf.args[0] is not g:
+        leaf = Lazy(g)
+        _NODES[("leaf", id(g))] = leaf
+    return leaf
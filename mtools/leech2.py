@@ -0,0 +1,132 @@
+"""Arithmetic in Q = Q_x0 = 2^{1+24} on 25-bit integers.
+
+An element of Q is encoded as in mmgroup's class XLeech2: bits 0-23 give its
+image in the Leech lattice mod 2, and bit 24 is the sign, i.e. the central
+involution z = MM("M<x_1000h>") is encoded as 0x1000000. All functions accept
+integers or NumPy arrays of integers (which are processed elementwise).
+
+The class in the Monster of an element of Q is determined by the type of its
+image in the Leech lattice mod 2, so 2A/2B tests for elements and subgroups of
+Q need no computation in the Monster.
+"""
+
+import numpy as np
+
+from mmgroup import MM, XLeech2
+from mmgroup.generators import gen_leech2_op_word_many, gen_leech2_type
+
+
+# the central involution z of G = 2^{1+24}.Co_1
+Z = 0x1000000
+
+# PARITY[d] is the parity of the bit vector d, for 0 <= d < 2^12
+PARITY = np.array([bin(d).count("1") & 1 for d in range(0x1000)], dtype=np.uint32)
+
+
+# Conversion between mmgroup elements of Q and integers.
+def from_mm(g):
+    return XLeech2(g).ord
+
+def to_mm(x):
+    return MM(XLeech2(int(x)))
+
+def as_array(L):
+    return np.array([x if isinstance(x, (int, np.integer)) else from_mm(x) for x in L], dtype=np.uint32)
+
+
+# The group operation of Q: the images in the Leech lattice mod 2 are added, and
+# the sign is given by the cocycle <d1, delta2> (as in gen_leech2_mul).
+def mul(x, y):
+    x, y = np.asarray(x, dtype=np.uint32), np.asarray(y, dtype=np.uint32)
+    return x ^ y ^ (PARITY[(y >> 12) & x & 0xfff] << 24)
+
+
+# The quadratic form q on the Leech lattice mod 2; x**2 = z**q(x).
+def q(x):
+    x = np.asarray(x, dtype=np.uint32)
+    return PARITY[(x >> 12) & x & 0xfff]
+
+
+# The symplectic form on the Leech lattice mod 2; [x,y] = z**scalprod(x,y).
+def scalprod(x, y):
+    x, y = np.asarray(x, dtype=np.uint32), np.asarray(y, dtype=np.uint32)
+    return PARITY[((x >> 12) & y ^ (y >> 12) & x) & 0xfff]
+
+def commutator(x, y):
+    return scalprod(x, y) << 24
+
+def commute(x, y):
+    return scalprod(x, y) == 0
+
+
+# Element orders: 1 for the identity, 4 if x**2 = z, and 2 otherwise.
+def order(x):
+    x = np.asarray(x, dtype=np.uint32)
+    return np.where(x == 0, 1, np.where(q(x) == 1, 4, 2))
+
+
+# The type (0, 2, 3 or 4) of the image of x in the Leech lattice mod 2.
+_leech_type = np.frompyfunc(gen_leech2_type, 1, 1)
+
+def leech_type(x):
+    x = np.asarray(x, dtype=np.uint32)
+    return np.asarray(_leech_type(x & 0xffffff), dtype=np.uint32)[()]
+
+
+# The class of x in the Monster, numbered as in conjugate_involution(): 0 for the
+# identity, 1 for 2A and 2 for 2B; elements of order 4 (type 3) give -1.
+# A non-central x is conjugate to x*z in Q, so the class only depends on the type:
+# type 2 gives 2A, and z (type 0) and type 4 give 2B.
+def involution_class(x):
+    x = np.asarray(x, dtype=np.uint32)
+    t = leech_type(x)
+    return np.where(x == 0, 0, np.where(t == 2, 1, np.where(t == 3, -1, 2)))
+
+
+# The image of x under conjugation by the element g of G_x0 (i.e. x**g).
+# gen_leech2_op_word_many stops at the first atom of g outside G_x0 and returns
+# the number of atoms applied; if that happens for the word of g as it is, g is
+# reduced and tried again, and a ValueError is raised if g is not in G_x0.
+def conjugate(x, g):
+    for k in range(2):
+        data = g.mmdata
+        a = np.array(x, dtype=np.uint32, ndmin=1)
+        if gen_leech2_op_word_many(a, len(a), data, len(data)) == len(data):
+            return a if np.ndim(x) else a[0]
+        g.reduce()
+    raise ValueError("The element does not lie in G_x0")
+
+
+# The orbit of x (an integer) under conjugation by the group generated by the
+# elements of G_x0 in the list gens, as a list of integers in order of discovery
+# (see mtools/orbits.py).
+def orbit(x, gens):
+    from .orbits import LEECH2, Orbit
+    return Orbit(int(x), gens, LEECH2).points
+
+
+# The elements of the subgroup of Q generated by the elements in L, as a sorted
+# array of integers.
+def span(L):
+    H = np.zeros(1, dtype=np.uint32)
+    for x in as_array(L):
+        if np.any(H == x):
+            continue
+        # <H,x> = H u Hx, after adding z if x**2 = z or if x does not centralise H
+        if q(x) == 1 or np.any(scalprod(H, x) == 1):
+            H = np.union1d(H, mul(H, Z))
+        H = np.union1d(H, mul(H, x))
+    return H
+
+
+# The number of elements of each type (0, 2, 3, 4) in the subgroup of Q generated
+# by the elements in L, as an array indexed by the type.
+def type_histogram(L):
+    return np.bincount(leech_type(span(L)), minlength=5)
+
+
+# True if every non-identity element of the subgroup of Q generated by the
+# elements in L is a 2B-involution.
+def is_2B_pure(L):
+    H = span(L)
+    return bool(np.all(involution_class(H[H != 0]) == 2))
@@ -0,0 +1,177 @@
+"""Orbits, Schreier vectors and stabilisers for actions of subgroups of the Monster.
+
+An action is given by a function act(x, g), the image of the point x under the
+element g, and a function key(x), a canonical (hashable) form of x, so that two
+points are equal if and only if they have the same key. If a point has several
+forms (e.g. a cyclic subgroup, given by any of its generators), the action also
+has a function aliases(x), the list of the keys of all forms of x; the orbit
+then stores all of them, and the cheap key of any form identifies the point.
+The actions provided are
+
+  CONJUGATION:          mmgroup elements, x -> x**g;
+  RIGHT_MULTIPLICATION: mmgroup elements, x -> x*g;
+  CYCLIC_CONJUGATION:   cyclic subgroups <x> of the Monster, given by a generator
+                        x, under conjugation (the aliases of <x> are the keys
+                        of all generators of <x>);
+  LEECH2:               elements of Q_x0 as 25-bit integers (see mtools/leech2.py),
+                        under conjugation by elements of G_x0;
+  MMV:                  vectors in a representation MMV(p) of the Monster, x -> x*g
+                        (the key is a SHA-256 digest of the entries of x).
+
+The class Orbit computes the orbit of a point under the group generated by a
+list of elements, by breadth-first search. The Schreier vector is stored as two
+NumPy arrays: for each point other than the first, the position of the point it
+was found from and the index of the generator mapping that point to it. From
+these, Orbit.transversal(i) gives an element mapping the first point to the
+i-th one, and Orbit.stabiliser_generators() gives generators of the stabiliser
+of the first point (by Schreier's lemma). The action of each generator on the
+orbit is also kept, as a NumPy index array (Orbit.perms).
+"""
+
+import hashlib
+import math
+from array import array
+
+import numpy as np
+
+from .leech2 import conjugate
+
+
+class Action:
+    def __init__(self, name, act, key, aliases=None):
+        self.name = name
+        self.act = act
+        self.key = key
+        self.aliases = (lambda x: [key(x)]) if aliases is None else aliases
+
+    def __repr__(self):
+        return "<Action %s>" % self.name
+
+
+def _mm_key(g):
+    return tuple(g.as_tuples())
+
+# The keys of the generators x**e of the cyclic subgroup <x>, with e coprime to
+# the order n of x (found by listing the powers, up to max_order).
+def _generator_keys(x, max_order=119):
+    keys = [_mm_key(x)]
+    y = x * x
+    while keys[-1] and len(keys) <= max_order:
+        keys.append(_mm_key(y))
+        y = y * x
+    if keys[-1]:
+        raise ValueError("The order of the element exceeds %d" % max_order)
+    n = len(keys)
+    return [k for e, k in enumerate(keys, 1) if math.gcd(e, n) == 1]
+
+def _leech2_act(x, g):
+    return int(conjugate(x, g))
+
+def _mmv_key(v):
+    return hashlib.sha256(v.as_bytes().tobytes()).digest()
+
+
+CONJUGATION = Action("conjugation", lambda x, g: x**g, _mm_key)
+RIGHT_MULTIPLICATION = Action("right multiplication", lambda x, g: x * g, _mm_key)
+CYCLIC_CONJUGATION = Action("conjugation of cyclic subgroups", lambda x, g: x**g, _mm_key, _generator_keys)
+LEECH2 = Action("conjugation on Q_x0", _leech2_act, int)
+MMV = Action("right multiplication on MMV", lambda v, g: v * g, _mmv_key)
+
+
+class Orbit:
+    # The orbit of the point x under the group generated by the list gens, acting
+    # via action. If max_length is given, the computation stops after max_length
+    # points have been found, and complete is set to False.
+    def __init__(self, x, gens, action=CONJUGATION, max_length=None):
+        self.gens = list(gens)
+        self.action = action
+        self.points = [x]
+        self.positions = dict.fromkeys(action.aliases(x), 0)
+        parent, gen = array("i", [-1]), array("h", [-1])
+        perms = [array("i") for g in self.gens]
+        self.complete = True
+        j = 0
+        while j < len(self.points):
+            for k, g in enumerate(self.gens):
+                y = action.act(self.points[j], g)
+                key = action.key(y)
+                if not key in self.positions:
+                    if max_length is not None and len(self.points) >= max_length:
+                        self.complete = False
+                        break
+                    for alias in action.aliases(y):
+                        self.positions[alias] = len(self.points)
+                    self.points.append(y)
+                    parent.append(j)
+                    gen.append(k)
+                perms[k].append(self.positions[key])
+            if not self.complete:
+                break
+            j += 1
+        self.parent = np.frombuffer(parent, dtype=np.int32)
+        self.gen = np.frombuffer(gen, dtype=np.int16)
+        # perms[k][j] is the position of the image of the j-th point under gens[k]
+        # (only for complete orbits)
+        self.perms = [np.frombuffer(p, dtype=np.int32) for p in perms] if self.complete else None
+        self._transversal = {0: None}
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        return "<Orbit of length %d%s under %s>" % (
+            len(self), "" if self.complete else " (incomplete)", self.action.name)
+
+    # The position of the point x in the orbit, or None.
+    def index(self, x):
+        return self.positions.get(self.action.key(x))
+
+    def __contains__(self, x):
+        return self.index(x) is not None
+
+    # A word (a list of generator indices) mapping the first point to the i-th one.
+    def word(self, i):
+        w = []
+        while i != 0:
+            w.append(int(self.gen[i]))
+            i = int(self.parent[i])
+        return w[::-1]
+
+    # An element of the group mapping the first point to the i-th one (None for
+    # i = 0, standing for the identity); the elements are cached along the tree.
+    def transversal(self, i):
+        if not i in self._transversal:
+            u = self.transversal(int(self.parent[i]))
+            g = self.gens[self.gen[i]]
+            self._transversal[i] = g if u is None else u * g
+        return self._transversal[i]
+
+    # Generators of the stabiliser of the first point: the Schreier generators
+    # u_j * g * u_l**-1 for the points j and generators g with j^g = l, other than
+    # those of the edges of the tree, without repetitions and the identity.
+    # Requires a complete orbit and mmgroup elements as generators.
+    def stabiliser_generators(self):
+        assert self.complete
+        result, seen = [], {()}
+        for j in range(len(self)):
+            for k, g in enumerate(self.gens):
+                l = int(self.perms[k][j])
+                if l != 0 and self.parent[l] == j and self.gen[l] == k:
+                    continue
+                u, v = self.transversal(j), self.transversal(l)
+                s = g if u is None else u * g
+                s = s if v is None else s * v**-1
+                key = _mm_key(s)
+                if not key in seen:
+                    seen.add(key)
+                    result.append(s)
+        return result
+
+
+# The orbit of x under the group generated by gens (see Orbit), as a list of
+# points in order of discovery, or False if it has more than max_length points.
+def orbit(x, gens, action=CONJUGATION, max_length=None):
+    O = Orbit(x, gens, action, None if max_length is None else max_length + 1)
+    if max_length is not None and len(O) > max_length:
+        return False
+    return O.points
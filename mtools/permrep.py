@@ -0,0 +1,100 @@
+"""Permutation representations of small subgroups of the Monster.
+
+A subgroup generated by a few elements of the Monster often acts faithfully on
+a small set, e.g. an almost simple group on the conjugates of one of its cyclic
+subgroups (PSL_2(13):2 on the 14 conjugates of <g13>). The function
+conjugation_rep computes the orbit of <x> under conjugation by the generators
+and returns the generators as permutations of the orbit (NumPy index arrays).
+Element orders, cycle types and the order of the group are then computed with
+permutations, and words in the generators can be mapped back to the Monster.
+"""
+
+import random
+
+import numpy as np
+
+from .orbits import CYCLIC_CONJUGATION, Orbit
+from .slp import MM_OPS, PERM_OPS
+from .words import WordEvaluator
+
+
+class PermRep:
+    # gens are the mmgroup elements with the given names, and perms[k] is the
+    # permutation of the points induced by gens[k], with i^g = perms[k][i].
+    def __init__(self, gens, names, points, perms):
+        self.gens = list(gens)
+        self.names = list(names)
+        self.points = points
+        self.perms = [np.array(p, dtype=np.int32) for p in perms]
+        self.degree = len(points)
+        self._perm_words = WordEvaluator(dict(zip(self.names, self.perms)), PERM_OPS)
+        self._mm_words = WordEvaluator(dict(zip(self.names, self.gens)), MM_OPS)
+
+    def __repr__(self):
+        return "<PermRep of degree %d on %s>" % (self.degree, ", ".join(self.names))
+
+    # The permutation, and the mmgroup element, given by a word in the generators
+    # (in the syntax of mtools/words.py).
+    def perm(self, word):
+        return self._perm_words(word)
+
+    def to_mm(self, word):
+        return self._mm_words(word)
+
+    # The lengths of the cycles of the permutation p (or of the word p), in
+    # decreasing order.
+    def cycle_type(self, p):
+        p = self.perm(p) if isinstance(p, str) else p
+        seen = np.zeros(self.degree, dtype=bool)
+        lengths = []
+        for i in range(self.degree):
+            if not seen[i]:
+                n, j = 0, i
+                while not seen[j]:
+                    seen[j] = True
+                    j, n = p[j], n + 1
+                lengths.append(n)
+        return sorted(lengths, reverse=True)
+
+    # The order of the permutation p (or of the word p); this is the order of the
+    # corresponding element of the Monster if the representation is faithful.
+    def order(self, p):
+        n = 1
+        for l in set(self.cycle_type(p)):
+            n = n * l // np.gcd(n, l)
+        return int(n)
+
+    # The order of the permutation group, by listing its elements (so only for
+    # small groups); returns False if it has more than n elements.
+    def group_order(self, n=10**6):
+        one = np.arange(self.degree, dtype=np.int32)
+        elements = [one]
+        seen = {one.tobytes()}
+        j = 0
+        while j < len(elements):
+            for p in self.perms:
+                x = p[elements[j]]
+                if not x.tobytes() in seen:
+                    seen.add(x.tobytes())
+                    elements.append(x)
+                    if len(elements) > n:
+                        return False
+            j += 1
+        return len(elements)
+
+    # A random word of the given length in the generators, and its permutation.
+    def random_element(self, length=20, rng=random):
+        word = "*".join(rng.choice(self.names) for i in range(length))
+        return word, self.perm(word)
+
+
+# The permutation representation of the group generated by gens (a list of
+# mmgroup elements with the given names) on the orbit of the cyclic subgroup
+# <x> under conjugation, or False if the orbit has more than max_points points.
+# The points are the conjugates of x, one for each conjugate of <x>.
+def conjugation_rep(gens, x, names=None, max_points=1000):
+    names = ["g%d" % i for i in range(len(gens))] if names is None else names
+    O = Orbit(x, gens, CYCLIC_CONJUGATION, max_points)
+    if not O.complete:
+        return False
+    return PermRep(gens, names, O.points, O.perms)
@@ -0,0 +1,73 @@
+"""Checking that group elements satisfy a presentation.
+
+A presentation is given by the names of its generators and a list of relators,
+i.e. words in the generators (in the syntax of mtools/words.py) that have to
+evaluate to the identity, e.g.
+
+    A5 = Presentation(["a", "b"], ["a**2", "b**3", "(a*b)**5"])
+    A5.verify([g2_G, g3_G])
+
+All relators are evaluated in one batch, so that common subwords and powers are
+computed only once; then each relator is checked to be the identity.
+The order of the presented group (if it is small enough) can be computed by
+coset enumeration, see mtools/cosets.py.
+"""
+
+import multiprocessing as mp
+
+from .cosets import enumerate_cosets
+from .slp import MM_OPS
+from .words import WordEvaluator, parse_word
+
+
+# The relators in the list words (parsed words) that are not satisfied by the
+# generators gens (a dictionary mapping names to group elements).
+def _failures(gens, words, backend):
+    W = WordEvaluator(gens, backend)
+    return [i for i, x in zip(range(len(words)), W.evaluate(words)) if not backend.is_one(x)]
+
+
+class Presentation:
+    def __init__(self, gens, relators):
+        self.gens = list(gens)
+        self.relators = list(relators)
+        self.words = [parse_word(r) for r in self.relators]
+        for w in self.words:
+            self._check_letters(w)
+
+    def _check_letters(self, w):
+        for base, e in w:
+            if isinstance(base, str):
+                if not base in self.gens:
+                    raise ValueError("relator contains unknown generator %r" % base)
+            else:
+                self._check_letters(base)
+
+    def __repr__(self):
+        return "<%s | %s>" % (", ".join(self.gens), ", ".join(self.relators))
+
+    # The relators (as strings) that are not satisfied by images, a list of group
+    # elements (one for each generator, in order) or a dictionary mapping the
+    # generator names to group elements. The relators can be distributed over
+    # n_processes worker processes; each worker evaluates its share in one batch.
+    def failures(self, images, n_processes=1, backend=MM_OPS):
+        gens = images if isinstance(images, dict) else dict(zip(self.gens, images))
+        assert set(gens) >= set(self.gens)
+        if n_processes == 1:
+            failed = _failures(gens, self.words, backend)
+        else:
+            n_processes = min(n_processes, len(self.words))
+            shares = [list(range(len(self.words)))[k::n_processes] for k in range(n_processes)]
+            with mp.Pool(n_processes) as pool:
+                results = pool.starmap(_failures, [(gens, [self.words[i] for i in share], backend) for share in shares])
+            failed = sorted(share[i] for share, result in zip(shares, results) for i in result)
+        return [self.relators[i] for i in failed]
+
+    # Returns True if images satisfy all relators; the arguments are as above.
+    def verify(self, images, n_processes=1, backend=MM_OPS):
+        return not self.failures(images, n_processes, backend)
+
+    # The order of the presented group, i.e. the number of cosets of the trivial
+    # subgroup (see mtools/cosets.py).
+    def order(self, max_cosets=2**22):
+        return len(enumerate_cosets(self, [], max_cosets))
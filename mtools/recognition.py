@@ -0,0 +1,154 @@
+"""Probabilistic recognition of subgroups of the Monster from element orders.
+
+The function recognise draws random elements of the group generated by a list
+of mmgroup elements (by the product replacement algorithm, as get_random in
+maximals_of_M) and compares the histogram of their orders with stored order
+statistics of candidate groups:
+
+* a candidate is excluded if a sampled element has an order that does not
+  divide the order of the candidate; the sampled element is kept as a witness;
+* the other candidates are ranked by the likelihood of the sampled orders under
+  the stored histogram of the candidate (with add-one smoothing).
+
+This gives a fast first answer, not a proof: e.g. for 2.B it does not exclude
+a proper subgroup of 2.B whose element orders were all sampled, but the
+witnesses found (such as elements of orders 17 and 31) are the elements used
+in the proofs of generation.
+
+The stored statistics (in order_statistics.json next to this file) are the
+orders of random elements of the candidate groups, sampled with
+order_statistics from the standard generators in other_gens (and from random
+elements for the Monster itself); they can be extended with save_statistics.
+"""
+
+import json
+import math
+import multiprocessing as mp
+import os
+import random
+
+
+STATISTICS = os.path.join(os.path.dirname(__file__), "order_statistics.json")
+
+# The orders of the candidate groups.
+GROUP_ORDERS = {
+    "M": 2**46 * 3**20 * 5**9 * 7**6 * 11**2 * 13**3 * 17 * 19 * 23 * 29 * 31 * 41 * 47 * 59 * 71,
+    "2.B": 2**42 * 3**13 * 5**6 * 7**2 * 11 * 13 * 17 * 19 * 23 * 31 * 47,
+    "3.Fi24": 2**22 * 3**17 * 5**2 * 7**3 * 11 * 13 * 17 * 23 * 29,
+    "Th": 2**15 * 3**10 * 5**3 * 7**2 * 13 * 19 * 31,
+    "PSL2(29):2": 29 * (29**2 - 1),
+}
+
+
+# n elements of the group generated by L, by product replacement on a list of
+# at least 6 elements (after burn_in initial steps) with random choices from
+# the given seed; returns the list of pairs (order, element).
+def _sample(L, n, seed, burn_in=50):
+    rng = random.Random(seed)
+    L = list(L)
+    while len(L) < 6:
+        L.append(rng.choice(L))
+    samples = []
+    for i in range(burn_in + n):
+        a, b = rng.sample(range(len(L)), 2)
+        L[a] = L[a]*L[b] if rng.choice([0,1]) else L[b]*L[a]
+        if i >= burn_in:
+            samples.append((L[a].order(), L[a]))
+    return samples
+
+
+# A list of n_samples pairs (order, element) for random elements of the group
+# generated by L; the samples are drawn in n_processes independent chains.
+def sample_orders(L, n_samples=100, n_processes=1, seed=None):
+    seed = random.randrange(2**32) if seed is None else seed
+    shares = [n_samples // n_processes + (k < n_samples % n_processes) for k in range(n_processes)]
+    if n_processes == 1:
+        return _sample(L, n_samples, seed)
+    with mp.Pool(n_processes) as pool:
+        results = pool.starmap(_sample, [(L, n, seed + k) for k, n in enumerate(shares)])
+    return [s for r in results for s in r]
+
+
+# The histogram of the orders of n_samples random elements of the group
+# generated by L, as a dictionary mapping orders to counts.
+def order_statistics(L, n_samples=100, n_processes=1, seed=None):
+    histogram = {}
+    for o, g in sample_orders(L, n_samples, n_processes, seed):
+        histogram[o] = histogram.get(o, 0) + 1
+    return dict(sorted(histogram.items()))
+
+
+# The stored statistics, as a dictionary mapping the names of the candidates to
+# their histograms.
+def load_statistics(path=STATISTICS):
+    with open(path) as f:
+        data = json.load(f)
+    return {name: {int(o): c for o, c in h.items()} for name, h in data.items()}
+
+# Add (or replace) the histogram of the candidate name in the stored statistics.
+def save_statistics(name, histogram, path=STATISTICS):
+    data = load_statistics(path) if os.path.exists(path) else {}
+    data[name] = histogram
+    with open(path, "w") as f:
+        json.dump({n: {str(o): c for o, c in sorted(h.items())} for n, h in sorted(data.items())}, f, indent=1)
+
+
+# The log-likelihood of the list of orders under the histogram, where each order
+# in range(1, max_order+1) gets one additional count.
+def _log_likelihood(orders, histogram, max_order=119):
+    total = sum(histogram.values()) + max_order
+    return sum(math.log((histogram.get(o, 0) + 1) / total) for o in orders)
+
+
+class Recognition:
+    def __init__(self, samples, ranking, witnesses):
+        self.samples = samples
+        self.ranking = ranking
+        self.witnesses = witnesses
+
+    def __repr__(self):
+        return "<Recognition: %s>" % ", ".join("%s (%.1f)" % r for r in self.ranking)
+
+    # The candidate with the highest likelihood, or None if all are excluded.
+    def best(self):
+        return self.ranking[0][0] if self.ranking else None
+
+    # The histogram of the sampled orders.
+    def orders(self):
+        histogram = {}
+        for o, g in self.samples:
+            histogram[o] = histogram.get(o, 0) + 1
+        return dict(sorted(histogram.items()))
+
+    # One sampled element of each order in the list orders (or None).
+    def elements_of_order(self, orders):
+        found = {}
+        for o, g in self.samples:
+            if o in orders and not o in found:
+                found[o] = g
+        return [found.get(o) for o in orders]
+
+
+# Recognise the group generated by the list L of mmgroup elements among the
+# candidates (a list of names; by default all candidates with stored statistics)
+# from the orders of n_samples random elements. Returns a Recognition with
+# the attributes
+#   samples:   the list of pairs (order, element) of the random elements,
+#   ranking:   the list of pairs (name, log-likelihood) of the candidates that
+#              are not excluded, in decreasing order of likelihood,
+#   witnesses: a dictionary mapping each excluded candidate to a sampled
+#              element whose order does not divide the order of the candidate.
+def recognise(L, n_samples=100, n_processes=1, candidates=None, statistics=None, seed=None):
+    statistics = load_statistics() if statistics is None else statistics
+    candidates = list(statistics) if candidates is None else candidates
+    samples = sample_orders(L, n_samples, n_processes, seed)
+    orders = [o for o, g in samples]
+    ranking, witnesses = [], {}
+    for name in candidates:
+        excluded = [g for o, g in samples if GROUP_ORDERS[name] % o]
+        if excluded:
+            witnesses[name] = excluded[0]
+        else:
+            ranking.append((name, _log_likelihood(orders, statistics[name])))
+    ranking.sort(key=lambda r: -r[1])
+    return Recognition(samples, ranking, witnesses)
@@ -0,0 +1,322 @@
+"""The regular permutation representation of an enumerated subgroup of the Monster.
+
+Once the elements of a (small) subgroup of the Monster have been listed, e.g. by
+group_generated_by, an element is determined by its position in the list, and
+the right multiplication by each generator is a permutation of the positions,
+stored as a NumPy index array. Products, inverses, powers, orders and conjugates
+inside the subgroup are then computed by array lookups instead of Monster
+arithmetic; for small groups the full multiplication table can also be built.
+Centralisers, the elements inverting an element, and the elements of a given
+order are then found by comparing rows and columns of the table, and so are the
+conjugacy classes, their power maps and the classes of cyclic subgroups.
+"""
+
+import time
+from math import gcd
+
+import numpy as np
+
+from .orbits import CONJUGATION, Orbit
+
+
+def _key(g):
+    return tuple(g.as_tuples())
+
+
+class RegularRep:
+    # elements is the list of all elements of the group generated by the list gens
+    # (in any order); perms[k][i] is the position of elements[i]*gens[k]. If perms
+    # is not given, it is computed, which costs len(elements)*len(gens) products.
+    def __init__(self, elements, gens, perms=None):
+        self.elements = list(elements)
+        self.gens = list(gens)
+        self.positions = {_key(g): i for i, g in enumerate(self.elements)}
+        if perms is None:
+            perms = [[self.positions[_key(x*g)] for x in self.elements] for g in self.gens]
+        self.perms = [np.array(p, dtype=np.int32) for p in perms]
+        self.one = self.positions[()]
+        self.table = None
+        self._parent = None
+        self._orders = None
+        self._classes = None
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __repr__(self):
+        return "<RegularRep of a group of order %d on %d generators>" % (len(self), len(self.gens))
+
+    # The position of the mmgroup element g, or None if g is not in the group.
+    def index(self, g):
+        return self.positions.get(_key(g))
+
+    def __contains__(self, g):
+        return self.index(g) is not None
+
+    # A spanning tree of the Cayley graph, rooted at the identity: for i != one,
+    # elements[i] = elements[parent[i]] * gens[gen[i]].
+    def _tree(self):
+        if self._parent is None:
+            n = len(self)
+            parent = np.full(n, -1, dtype=np.int32)
+            gen = np.full(n, -1, dtype=np.int32)
+            parent[self.one] = self.one
+            layer = np.array([self.one], dtype=np.int32)
+            while len(layer):
+                new = []
+                for k, p in enumerate(self.perms):
+                    images = p[layer]
+                    fresh = parent[images] < 0
+                    parent[images[fresh]] = layer[fresh]
+                    gen[images[fresh]] = k
+                    new.append(images[fresh])
+                layer = np.unique(np.concatenate(new))
+            self._parent, self._gen = parent, gen
+        return self._parent, self._gen
+
+    # A word for elements[i] in the generators, as a list of generator indices.
+    def word(self, i):
+        parent, gen = self._tree()
+        w = []
+        while i != self.one:
+            w.append(int(gen[i]))
+            i = parent[i]
+        return w[::-1]
+
+    # The permutation of the positions given by right multiplication by elements[i].
+    def perm(self, i):
+        p = np.arange(len(self), dtype=np.int32)
+        for k in self.word(i):
+            p = self.perms[k][p]
+        return p
+
+    # The multiplication table: table[i,j] is the position of elements[i]*elements[j].
+    # It has len(self)**2 entries, so it should only be built for small groups.
+    def multiplication_table(self):
+        if self.table is None:
+            parent, gen = self._tree()
+            n = len(self)
+            table = np.empty((n, n), dtype=np.int32)
+            table[:,self.one] = np.arange(n, dtype=np.int32)
+            # fill the columns in order of distance from the identity
+            order = [self.one]
+            j = 0
+            children = [[] for _ in range(n)]
+            for i in range(n):
+                if i != self.one:
+                    children[parent[i]].append(i)
+            while j < len(order):
+                for c in children[order[j]]:
+                    table[:,c] = self.perms[gen[c]][table[:,order[j]]]
+                    order.append(c)
+                j += 1
+            self.table = table
+        return self.table
+
+    def mul(self, i, j):
+        if self.table is not None:
+            return int(self.table[i,j])
+        for k in self.word(j):
+            i = self.perms[k][i]
+        return int(i)
+
+    def inverse(self, i):
+        if self.table is not None:
+            return int(np.flatnonzero(self.table[i] == self.one)[0])
+        return int(np.flatnonzero(self.perm(i) == self.one)[0])
+
+    def power(self, i, e):
+        if e < 0:
+            i, e = self.inverse(i), -e
+        x = self.one
+        while e:
+            if e & 1:
+                x = self.mul(x, i)
+            e >>= 1
+            if e:
+                i = self.mul(i, i)
+        return x
+
+    # The length of the cycle of the identity under right multiplication by elements[i].
+    def order(self, i):
+        p = self.perm(i) if self.table is None else self.table[:,i]
+        x, n = p[self.one], 1
+        while x != self.one:
+            x, n = p[x], n + 1
+        return n
+
+    # The orders of all elements, as a NumPy array (using the multiplication table;
+    # computed once).
+    def orders(self):
+        if self._orders is None:
+            self._orders = self._compute_orders()
+        return self._orders
+
+    def _compute_orders(self):
+        T = self.multiplication_table()
+        n = len(self)
+        cols = np.arange(n)
+        x = cols.copy()
+        orders = np.zeros(n, dtype=np.int32)
+        k = 1
+        while (orders == 0).any():
+            orders[(x == self.one) & (orders == 0)] = k
+            x = T[x, cols]
+            k += 1
+        return orders
+
+    # The position of elements[i]**elements[j] = elements[j]**-1 * elements[i] * elements[j].
+    def conjugate(self, i, j):
+        return self.mul(self.mul(self.inverse(j), i), j)
+
+    # The positions of the inverses of all elements, as a NumPy array.
+    def inverses(self):
+        T = self.multiplication_table()
+        return np.argmax(T == self.one, axis=1).astype(np.int32)
+
+    # For each element x, the position in the orbit O of the image of the first
+    # point of O under x, where O is an Orbit under the generators of the group
+    # (see mtools/orbits.py); computed along the spanning tree of _tree.
+    def _orbit_images(self, O):
+        parent, gen = self._tree()
+        images = np.full(len(self), -1, dtype=np.int32)
+        images[self.one] = 0
+        while (images < 0).any():
+            todo = (images < 0) & (images[parent] >= 0)
+            for k, p in enumerate(O.perms):
+                m = todo & (gen == k)
+                images[m] = p[images[parent[m]]]
+        return images
+
+    # The positions of the elements x of the group with g**x in the list targets,
+    # for g not in the group, from the orbit of g under conjugation by the group
+    # (which must have at most max_length points).
+    def _conjugating(self, g, targets, max_length):
+        O = Orbit(g, self.gens, CONJUGATION, max_length)
+        if not O.complete:
+            raise ValueError("the conjugates of g under the group are too many")
+        points = [O.index(t) for t in targets]
+        images = self._orbit_images(O)
+        return np.flatnonzero(np.isin(images, [i for i in points if i is not None]))
+
+    # The positions of the elements of the group commuting with g, an element of
+    # the group (given by its position or as an mmgroup element) or an mmgroup
+    # element outside the group, whose conjugates under the group are then
+    # computed (at most max_length of them).
+    def centraliser(self, g, max_length=10000):
+        i = g if isinstance(g, (int, np.integer)) else self.index(g)
+        if i is None:
+            return self._conjugating(g, [g], max_length)
+        T = self.multiplication_table()
+        return np.flatnonzero(T[i,:] == T[:,i])
+
+    # The positions of the elements x of the group with g**x == g**-1, for g as
+    # in centraliser.
+    def elements_inverting(self, g, max_length=10000):
+        i = g if isinstance(g, (int, np.integer)) else self.index(g)
+        if i is None:
+            return self._conjugating(g, [g**-1], max_length)
+        T = self.multiplication_table()
+        return np.flatnonzero(T[i,:] == T[:,self.inverse(i)])
+
+    # The positions of the elements of order n.
+    def elements_of_order(self, n):
+        return np.flatnonzero(self.orders() == n)
+
+    # The conjugacy classes, as a list of arrays of positions, sorted by element
+    # order and then by class size; the first (smallest) position of each class
+    # is its representative. The classes are the connected components of the
+    # graph of conjugation by the generators, found by propagating the smallest
+    # position along its edges.
+    def conjugacy_classes(self):
+        if self._classes is None:
+            T = self.multiplication_table()
+            inv = self.inverses()
+            gens = [self.index(g) for g in self.gens]
+            conj = [T[inv[k], T[:,k]] for k in gens]
+            conj += [np.argsort(p).astype(np.int32) for p in conj]
+            labels = np.arange(len(self), dtype=np.int32)
+            while True:
+                new = labels
+                for p in conj:
+                    new = np.minimum(new, new[p])
+                if np.array_equal(new, labels):
+                    break
+                labels = new
+            reps, self._class_of = np.unique(labels, return_inverse=True)
+            orders = self.orders()
+            sizes = np.bincount(self._class_of)
+            order = sorted(range(len(reps)), key=lambda k: (orders[reps[k]], sizes[k], reps[k]))
+            rank = np.argsort(order)
+            self._class_of = rank[self._class_of].astype(np.int32)
+            self._classes = [np.flatnonzero(self._class_of == k) for k in range(len(reps))]
+        return self._classes
+
+    # The index (in conjugacy_classes()) of the class of elements[i].
+    def class_of(self, i):
+        self.conjugacy_classes()
+        return int(self._class_of[i])
+
+    # The power map: for each class, the index of the class of the e-th powers of
+    # its elements, as a NumPy array.
+    def power_map(self, e):
+        return np.array([self.class_of(self.power(int(c[0]), e)) for c in self.conjugacy_classes()], dtype=np.int32)
+
+    # The classes of cyclic subgroups, as lists of the indices of the classes of
+    # their generators.
+    def cyclic_subgroup_classes(self):
+        classes = self.conjugacy_classes()
+        orders = self.orders()
+        seen, result = set(), []
+        for k, c in enumerate(classes):
+            if not k in seen:
+                n = int(orders[c[0]])
+                gens = sorted({self.class_of(self.power(int(c[0]), e)) for e in range(1, n + 1) if gcd(e, n) == 1})
+                seen.update(gens)
+                result.append(gens)
+        return result
+
+    # The classes of maximal cyclic subgroups, given by the index of the class of
+    # one generator each (the smallest). The Monster classes of all elements of the
+    # group are determined by those of these representatives and their powers.
+    def maximal_cyclic_subgroup_classes(self):
+        orders = self.orders()
+        below = set()
+        for c in self.conjugacy_classes():
+            n = int(orders[c[0]])
+            for p in range(2, n + 1):
+                if n % p == 0 and all(p % q for q in range(2, p)):
+                    below.add(self.class_of(self.power(int(c[0]), p)))
+        return [gens[0] for gens in self.cyclic_subgroup_classes() if not below.intersection(gens)]
+
+# Construct the group generated by the list L of mmgroup elements as in
+# group_generated_by (mtools/groups.py), recording the right multiplication by
+# the elements of L, and return its regular representation (or False if the
+# group has more than n elements).
+def regular_rep(L, n, verbose=True):
+    start = time.time()
+    elements = []
+    positions = {}
+    for g in [L[0]*L[0]**-1] + list(L):
+        if not _key(g) in positions:
+            positions[_key(g)] = len(elements)
+            elements.append(g)
+    perms = [[] for g in L]
+    j = 0
+    while j < len(elements):
+        for k, g in enumerate(L):
+            x = elements[j]*g
+            key = _key(x)
+            if not key in positions:
+                positions[key] = len(elements)
+                elements.append(x)
+            perms[k].append(positions[key])
+        j = j+1
+        end = time.time()
+        if verbose:
+            print("Limit", n, "; have", len(elements), "in time ", round(end-start,4), end='\r')
+        if len(elements) > n:
+            if verbose:
+                print("Group is larger than imposed limit -- abort in time ", round(end-start,4))
+            return False
+    return RegularRep(elements, L, perms)
@@ -0,0 +1,245 @@
+"""Straight-line programs (SLPs), e.g. those in the GAP file A5_in_A12_SLP.g.
+
+An SLP on n inputs is stored as a list of primitive operations. Slots 0,...,n-1
+hold the inputs, and the k-th operation writes slot n+k. An operation is either
+("mul", i, j), the product of slots i and j, or ("pow", i, e), the e-th power
+(e a nonzero integer) of slot i. Several SLPs on the same inputs can be merged
+into one SLP with several outputs, in which each intermediate result that the
+SLPs have in common is computed only once.
+
+SLPs can be evaluated on mmgroup elements, on matrices over GF(2), and on
+permutations; see the backends MM_OPS, GF2_OPS and PERM_OPS below.
+"""
+
+import re
+
+import numpy as np
+
+
+# Backends: objects providing mul(x,y), inv(x) and is_one(x) for a type of group
+# element, and optionally pow(x,e) for a positive integer e.
+class _MMOps:
+    def mul(self, x, y):
+        return x*y
+    def inv(self, x):
+        return x**-1
+    # the reduced form of the identity is the empty word (possibly padded with
+    # trivial atoms in mmdata, which as_tuples() discards)
+    def is_one(self, x):
+        x.reduce()
+        return len(x.as_tuples()) == 0
+    # for large exponents, mmgroup computes powers faster than repeated multiplication
+    def pow(self, x, e):
+        return x**e
+
+# Square matrices over GF(2) (NumPy arrays with entries 0 and 1), acting on row
+# vectors, e.g. the matrices returned by elt_to_24_mat in maximals_of_M.py.
+class _GF2Ops:
+    def mul(self, x, y):
+        return (np.asarray(x, dtype=np.int64) @ np.asarray(y, dtype=np.int64)) % 2
+    def inv(self, x):
+        n = len(x)
+        m = np.concatenate([np.asarray(x, dtype=np.uint8) % 2, np.eye(n, dtype=np.uint8)], axis=1)
+        for c in range(n):
+            pivots = np.flatnonzero(m[c:,c])
+            if len(pivots) == 0:
+                raise ValueError("The matrix is singular over GF(2)")
+            p = c + pivots[0]
+            m[[c,p]] = m[[p,c]]
+            rows = np.flatnonzero(m[:,c])
+            m[rows[rows != c]] ^= m[c]
+        return m[:,n:].astype(np.int64)
+    def is_one(self, x):
+        return np.array_equal(np.asarray(x) % 2, np.eye(len(x), dtype=np.int64))
+
+# Permutations p of {0,...,n-1} as NumPy arrays, with i^p = p[i]; products are
+# composed from left to right, as in GAP.
+class _PermOps:
+    def mul(self, x, y):
+        return np.asarray(y)[np.asarray(x)]
+    def inv(self, x):
+        return np.argsort(x)
+    def is_one(self, x):
+        return np.array_equal(x, np.arange(len(x)))
+
+MM_OPS = _MMOps()
+GF2_OPS = _GF2Ops()
+PERM_OPS = _PermOps()
+
+
+# The permutation of {0,...,n-1} given by a list of cycles on the points 1,...,n,
+# e.g. perm_from_cycles([(1,3),(2,4,5,6,7,8,9,10,11,12)], 12) for the GAP
+# permutation (1,3)(2,4,5,6,7,8,9,10,11,12).
+def perm_from_cycles(cycles, n):
+    p = np.arange(n)
+    for c in cycles:
+        for i in range(len(c)):
+            p[c[i]-1] = c[(i+1) % len(c)]-1
+    return p
+
+
+# The number of multiplications used to compute x**e from x by repeated squaring
+# (a negative exponent costs an additional inversion); e must not be 0.
+def power_cost(e):
+    if e == 0:
+        raise ValueError("The exponent 0 is not supported")
+    e = abs(e)
+    return e.bit_length() - 1 + bin(e).count("1") - 1
+
+
+class _Builder:
+    # Records primitive operations, computing each distinct operation only once.
+    def __init__(self, n_inputs):
+        self.n_inputs = n_inputs
+        self.ops = []
+        self.slots = {}
+        self.written_cost = 0
+
+    def op(self, *op):
+        self.written_cost += 1 if op[0] == "mul" else power_cost(op[2])
+        if op[0] == "pow" and op[2] == 1:
+            return op[1]
+        if not op in self.slots:
+            self.ops.append(op)
+            self.slots[op] = self.n_inputs + len(self.ops) - 1
+        return self.slots[op]
+
+    def slp(self, outputs):
+        return SLP(self.n_inputs, self.ops, outputs, self.written_cost)
+
+
+class SLP:
+    # The argument written_cost is the number of multiplications needed to
+    # evaluate the SLP(s) as written, i.e. without sharing any intermediate results.
+    def __init__(self, n_inputs, ops, outputs, written_cost=None):
+        # keep only the operations that are needed for the outputs
+        needed = set(outputs)
+        for k in reversed(range(len(ops))):
+            if n_inputs + k in needed:
+                needed.update([ops[k][1]] + ([ops[k][2]] if ops[k][0] == "mul" else []))
+        renumber = {i: i for i in range(n_inputs)}
+        self.ops = []
+        for k, op in enumerate(ops):
+            if n_inputs + k in needed:
+                renumber[n_inputs + k] = n_inputs + len(self.ops)
+                if op[0] == "mul":
+                    self.ops.append(("mul", renumber[op[1]], renumber[op[2]]))
+                else:
+                    self.ops.append(("pow", renumber[op[1]], op[2]))
+        self.n_inputs = n_inputs
+        self.outputs = [renumber[i] for i in outputs]
+        self.cost = sum(1 if op[0] == "mul" else power_cost(op[2]) for op in self.ops)
+        self.written_cost = self.cost if written_cost is None else written_cost
+        self.saved = self.written_cost - self.cost
+        # last_use[i] is the index of the last operation reading slot i
+        self.last_use = {}
+        for k, op in enumerate(self.ops):
+            for i in op[1:2] + (op[2:3] if op[0] == "mul" else ()):
+                self.last_use[i] = k
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __repr__(self):
+        return "<SLP on %d inputs with %d outputs, %d operations, %d multiplications (%d saved)>" % (
+            self.n_inputs, len(self.outputs), len(self.ops), self.cost, self.saved)
+
+    # Merge SLPs on the same inputs into a single SLP, whose outputs are the
+    # outputs of the given SLPs (in order).
+    @staticmethod
+    def merge(slps):
+        B = _Builder(slps[0].n_inputs)
+        outputs = []
+        for s in slps:
+            assert s.n_inputs == B.n_inputs
+            B.written_cost += s.written_cost - s.cost
+            slot = list(range(s.n_inputs))
+            for op in s.ops:
+                if op[0] == "mul":
+                    slot.append(B.op("mul", slot[op[1]], slot[op[2]]))
+                else:
+                    slot.append(B.op("pow", slot[op[1]], op[2]))
+            outputs += [slot[i] for i in s.outputs]
+        return B.slp(outputs)
+
+    # Evaluate the SLP on the list of inputs, using the given backend (see above).
+    # Powers are computed by repeated squaring with the backend's mul, which is
+    # faster for the small exponents occurring in SLPs than mmgroup's powering.
+    # Intermediate results are freed as soon as they are no longer needed.
+    # Returns the list of outputs; if report is True, also prints the number of
+    # multiplications performed and saved by sharing intermediate results.
+    def evaluate(self, inputs, backend=MM_OPS, report=False):
+        assert len(inputs) == self.n_inputs
+        keep = set(self.outputs)
+        slots = list(inputs) + [None] * len(self.ops)
+        mults = 0
+        for k, op in enumerate(self.ops):
+            x = slots[op[1]]
+            if op[0] == "mul":
+                slots[self.n_inputs + k] = backend.mul(x, slots[op[2]])
+                mults += 1
+            else:
+                e = op[2]
+                if e < 0:
+                    x, e = backend.inv(x), -e
+                y = None
+                while e:
+                    if e & 1:
+                        y = x if y is None else backend.mul(y, x)
+                        mults += y is not x
+                    e >>= 1
+                    if e:
+                        x = backend.mul(x, x)
+                        mults += 1
+                slots[self.n_inputs + k] = y
+            for i in op[1:2] + (op[2:3] if op[0] == "mul" else ()):
+                if self.last_use[i] == k and i >= self.n_inputs and not i in keep:
+                    slots[i] = None
+        if report:
+            print("SLP evaluated with", mults, "multiplications;", self.saved, "saved by sharing intermediate results")
+        return [slots[i] for i in self.outputs]
+
+
+_GAP_FUNCTION = re.compile(r"(\w+)\s*:=\s*function\s*\(([^)]*)\)(.*?)\bend\s*;", re.S)
+_GAP_FACTOR = re.compile(r"^(\w+)(?:\^(-?\d+))?$")
+
+# Parse the GAP functions in text that are SLPs, i.e. that consist of
+# assignments of products of powers of variables and a return statement (with
+# nonzero exponents, as the backends have no identity element).
+# Returns a dictionary mapping function names to SLPs.
+def parse_gap_slps(text):
+    slps = {}
+    for name, args, body in _GAP_FUNCTION.findall(text):
+        args = [a.strip() for a in args.split(",")]
+        B = _Builder(len(args))
+        var = {a: i for i, a in enumerate(args)}
+        output = None
+        for stmt in body.split(";"):
+            stmt = " ".join(stmt.split())
+            if not stmt or stmt.startswith("local "):
+                continue
+            if stmt.startswith("return "):
+                output = var[stmt[len("return "):]]
+                continue
+            lhs, rhs = [s.strip() for s in stmt.split(":=")]
+            slot = None
+            for factor in rhs.replace(" ", "").split("*"):
+                m = _GAP_FACTOR.match(factor)
+                if m is None:
+                    raise ValueError("not an SLP statement in %s: %s" % (name, stmt))
+                f = var[m.group(1)]
+                if m.group(2) is not None and int(m.group(2)) == 0:
+                    raise ValueError("exponent 0 in %s: %s" % (name, stmt))
+                if m.group(2) is not None:
+                    f = B.op("pow", f, int(m.group(2)))
+                slot = f if slot is None else B.op("mul", slot, f)
+            var[lhs] = slot
+        slps[name] = B.slp([output])
+    return slps
+
+
+# Read the SLPs with the given names from a GAP file and merge them into one SLP.
+def read_gap_slps(filename, names):
+    with open(filename) as f:
+        slps = parse_gap_slps(f.read())
+    return SLP.merge([slps[name] for name in names])
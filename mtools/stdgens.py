@@ -0,0 +1,166 @@
+"""Declarative specifications of (standard) generators of subgroups of the Monster.
+
+A specification consists of a name, a dictionary of named elements (the
+generators together with any witnesses, as mmgroup elements or strings in
+mmgroup format), and a list of checks. Each check is a tuple whose first entry
+is its kind; the other entries are words in the named elements (in the syntax
+of mtools/words.py) and numbers:
+
+    ("order", w, n)              w has order n
+    ("power", w, e, v)           w**e == v
+    ("power_in", w, e, [v,...])  w**e is one of the elements v,...
+    ("not_in", w, [v,...])       w is none of the elements v,...
+    ("commute", v, w)            v and w commute
+    ("inverts", v, w)            v inverts w, i.e. w**v == w**-1
+    ("involution_class", w, k)   w is an involution in class 2A (k = 1) or 2B (k = 2)
+    ("chi", w, c)                w lies in G_x0 and chi_G_x0()[0] == c
+    ("chi", w, c, v)             as above, after conjugating w by the element
+                                 that maps the 2B-involution v to the centre of G_x0
+    ("presentation", [relators]) the generators satisfy the relators (see
+                                 mtools/presentations.py)
+
+All words of a specification are evaluated with one WordEvaluator, so common
+subwords are computed only once. The function verify_specs checks several
+specifications, optionally in parallel (one specification per process), and
+can write a report in JSON format. With a ClaimStore (see mtools/claims.py),
+only the checks whose elements or code changed since the last run are
+evaluated again.
+"""
+
+import json
+import multiprocessing as mp
+import re
+import time
+
+from mmgroup import MM
+
+from .claims import claim_hash
+from .commuting import commutes
+from .elements import has_order
+from .presentations import Presentation
+from .words import WordEvaluator
+
+
+def _equal(x, y):
+    return x == y
+
+def _check_order(W, w, n):
+    return has_order(W(w), n)
+
+def _check_power(W, w, e, v):
+    return _equal(W("(%s)**%d" % (w, e)), W(v))
+
+def _check_power_in(W, w, e, vs):
+    x = W("(%s)**%d" % (w, e))
+    return any(_equal(x, W(v)) for v in vs)
+
+def _check_not_in(W, w, vs):
+    x = W(w)
+    return not any(_equal(x, W(v)) for v in vs)
+
+def _check_commute(W, v, w):
+    return commutes(W(v), W(w))
+
+def _check_inverts(W, v, w):
+    x = W(w)
+    return _equal(x**W(v), x**-1)
+
+def _check_involution_class(W, w, k):
+    return W(w).conjugate_involution()[0] == k
+
+def _check_chi(W, w, c, v=None):
+    x = W(w)
+    if v is not None:
+        k, h = W(v).conjugate_involution()
+        if k != 2:
+            return False
+        x = x**h
+    return x.in_G_x0() and x.chi_G_x0()[0] == c
+
+def _check_presentation(W, relators):
+    return Presentation(W.gens, relators).verify(W.gens)
+
+CHECKS = {
+    "order": _check_order,
+    "power": _check_power,
+    "power_in": _check_power_in,
+    "not_in": _check_not_in,
+    "commute": _check_commute,
+    "inverts": _check_inverts,
+    "involution_class": _check_involution_class,
+    "chi": _check_chi,
+    "presentation": _check_presentation,
+}
+
+
+class GeneratorSpec:
+    def __init__(self, name, elements, checks):
+        self.name = name
+        self.elements = {k: g if isinstance(g, MM) else MM(g) for k, g in elements.items()}
+        self.checks = [tuple(c) for c in checks]
+        for c in self.checks:
+            if not c[0] in CHECKS:
+                raise ValueError("unknown check %r in specification %s" % (c[0], name))
+
+    def __repr__(self):
+        return "<GeneratorSpec %s on %s with %d checks>" % (
+            self.name, ", ".join(self.elements), len(self.checks))
+
+    # The name of the check c in a ClaimStore, and the hash of the elements it
+    # refers to and of its code.
+    def claim(self, c):
+        names = set(re.findall(r"[A-Za-z_]\w*", repr(c[1:])))
+        inputs = {k: g for k, g in self.elements.items() if k in names}
+        return "%s: %r" % (self.name, c), claim_hash([inputs], (c, CHECKS[c[0]]))
+
+    # Run all checks, returning a dictionary with the results (see verify_specs).
+    # The results of checks whose hashes are keys of the dictionary known are
+    # taken from there.
+    def verify(self, known={}):
+        t = time.time()
+        W = WordEvaluator(self.elements)
+        results = []
+        for c in self.checks:
+            key = self.claim(c)[1]
+            if key in known:
+                results.append({"check": list(c), "passed": known[key], "reused": True})
+            else:
+                results.append({"check": list(c), "passed": bool(CHECKS[c[0]](W, *c[1:])), "reused": False})
+        return {"name": self.name, "passed": all(r["passed"] for r in results),
+                "seconds": round(time.time() - t, 2), "checks": results}
+
+
+def _verify(spec, known):
+    return spec.verify(known)
+
+
+# Verify a list of specifications, distributed over n_processes worker processes
+# (one specification per process at a time). Returns a list of dictionaries, one
+# for each specification, with entries "name", "passed", "seconds" and "checks",
+# the latter being the list of checks with the entries "passed" and "reused" for
+# each check. If report is a file name, the results are also written to that file
+# in JSON format. If store is a ClaimStore, the stored results of unchanged checks
+# are reused, and the results of the other checks are added to the store.
+def verify_specs(specs, n_processes=1, report=None, store=None):
+    known = [{} for spec in specs]
+    if store is not None:
+        for spec, k in zip(specs, known):
+            for c in spec.checks:
+                name, key = spec.claim(c)
+                result = store.lookup(name, key)
+                if result is not None:
+                    k[key] = result
+    if n_processes == 1:
+        results = [spec.verify(k) for spec, k in zip(specs, known)]
+    else:
+        with mp.Pool(min(n_processes, len(specs))) as pool:
+            results = pool.starmap(_verify, zip(specs, known), chunksize=1)
+    if store is not None:
+        for spec, r in zip(specs, results):
+            for c, rc in zip(spec.checks, r["checks"]):
+                if not rc["reused"]:
+                    store.record(*spec.claim(c), rc["passed"])
+    if report is not None:
+        with open(report, "w") as f:
+            json.dump({"passed": all(r["passed"] for r in results), "specs": results}, f, indent=1)
+    return results
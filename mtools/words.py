@@ -0,0 +1,171 @@
+"""Batch evaluation of words in a few generators, sharing common prefixes.
+
+Words are given as strings in Python syntax, e.g. "(a*b)**3*(a*b**2)" or
+"j2*g3**-1*(j2*g3)**5" (GAP-style powers "a^2" are also accepted), possibly
+containing commutators "Comm(x3,x10**3)" = x3**-1*(x10**3)**-1*x3*x10**3. The words
+of a batch are stored in a prefix trie, whose nodes are the distinct prefixes
+of the words; each node is evaluated once, at the cost of one multiplication.
+Powers of the generators and of parenthesised subwords are cached and built
+by repeated squaring, reusing the powers computed before.
+"""
+
+import re
+
+from .slp import MM_OPS, power_cost
+
+
+_TOKEN = re.compile(r"\s*(\*\*|\^|\*|\(|\)|,|-?\d+|\w+)")
+
+
+def _tokenize(s):
+    s = s.strip()
+    tokens, pos = [], 0
+    while pos < len(s):
+        m = _TOKEN.match(s, pos)
+        if m is None:
+            raise ValueError("cannot parse word %r at position %d" % (s, pos))
+        tokens.append(m.group(1))
+        pos = m.end()
+    return tokens
+
+
+# Append the letter (base, e) to the word w, merging it with the last letter of
+# w if that has the same base.
+def _append(w, base, e):
+    if w and w[-1][0] == base:
+        e = e + w[-1][1]
+        w = w[:-1]
+    return w + ((base, e),) if e else w
+
+
+def _inverse(w):
+    return tuple((base, -e) for base, e in reversed(w))
+
+
+# Parse a word into a tuple of letters (base, e), where base is the name of a
+# generator or a parenthesised subword (itself a tuple of letters), and e is a
+# nonzero integer.
+def parse_word(s):
+    tokens = _tokenize(s)
+    pos = 0
+
+    def product():
+        nonlocal pos
+        w = factor()
+        while pos < len(tokens) and tokens[pos] == "*":
+            pos += 1
+            for base, e in factor():
+                w = _append(w, base, e)
+        return w
+
+    def expect(token):
+        nonlocal pos
+        if pos == len(tokens) or tokens[pos] != token:
+            raise ValueError("expected %r in %r" % (token, s))
+        pos += 1
+
+    def factor():
+        nonlocal pos
+        if tokens[pos] == "(":
+            pos += 1
+            w = product()
+            expect(")")
+        elif tokens[pos] == "Comm" and tokens[pos+1:pos+2] == ["("]:
+            pos += 2
+            u = product()
+            expect(",")
+            v = product()
+            expect(")")
+            w = ()
+            for base, e in _inverse(u) + _inverse(v) + u + v:
+                w = _append(w, base, e)
+        else:
+            w = ((tokens[pos], 1),)
+            pos += 1
+        if pos < len(tokens) and tokens[pos] in ["**", "^"]:
+            e = int(tokens[pos+1])
+            pos += 2
+            if len(w) == 1:
+                w = ((w[0][0], w[0][1]*e),) if e else ()
+            elif e != 1:
+                w = ((w, e),) if e else ()
+        return w
+
+    # negative exponents such as "g3**(-1)"
+    tokens = re.sub(r"\(\s*(-\d+)\s*\)", r"\1", " ".join(tokens)).split()
+    w = product()
+    if pos != len(tokens):
+        raise ValueError("cannot parse word %r" % s)
+    return w
+
+
+class _Node:
+    __slots__ = ["value", "children"]
+
+    def __init__(self, value):
+        self.value = value
+        self.children = {}
+
+
+# An evaluator for words in the generators gens, a dictionary mapping names to
+# group elements (by default mmgroup elements; see mtools/slp.py for other backends).
+# Values of prefixes and powers are kept between calls of evaluate, so later
+# batches reuse the work done for earlier ones.
+class WordEvaluator:
+    def __init__(self, gens, backend=MM_OPS):
+        self.gens = dict(gens)
+        self.backend = backend
+        self.root = _Node(None)
+        self.powers = {}
+        self.nodes = 0
+        self.multiplications = 0
+
+    def __repr__(self):
+        return "<WordEvaluator with %d trie nodes, %d cached powers, %d multiplications>" % (
+            self.nodes, len(self.powers), self.multiplications)
+
+    def _mul(self, x, y):
+        self.multiplications += 1
+        return self.backend.mul(x, y)
+
+    def _word_value(self, w):
+        if not w:
+            raise ValueError("cannot evaluate the empty word")
+        node = self.root
+        for letter in w:
+            child = node.children.get(letter)
+            if child is None:
+                x = self._power(*letter)
+                child = _Node(x if node.value is None else self._mul(node.value, x))
+                node.children[letter] = child
+                self.nodes += 1
+            node = child
+        return node.value
+
+    # The e-th power of base (a generator name or a subword), built by repeated
+    # squaring from the cached powers (or by the backend, if it computes powers).
+    def _power(self, base, e):
+        key = (base, e)
+        if key in self.powers:
+            return self.powers[key]
+        if e == 1:
+            x = self.gens[base] if isinstance(base, str) else self._word_value(base)
+        elif e < 0:
+            x = self.backend.inv(self._power(base, -e))
+        elif hasattr(self.backend, "pow"):
+            x = self.backend.pow(self._power(base, 1), e)
+            self.multiplications += power_cost(e)
+        elif e % 2 == 0:
+            x = self._power(base, e // 2)
+            x = self._mul(x, x)
+        else:
+            x = self._mul(self._power(base, e - 1), self._power(base, 1))
+        self.powers[key] = x
+        return x
+
+    # Evaluate a list of words (strings or parsed words), returning their values.
+    def evaluate(self, words):
+        return [self._word_value(parse_word(w) if isinstance(w, str) else w) for w in words]
+
+    def __call__(self, word):
+        return self.evaluate([word])[0]
@@ -0,0 +1,201 @@
+"""Search for words in generators whose values have orders divisible by given primes.
+
+Proofs that elements generate a (sporadic) group usually exhibit words in the
+generators with certain element orders, e.g. elements of orders 17 and 31 in
+2.B, since no maximal subgroup of B contains elements of both orders. The
+function search_words finds such words: it enumerates words by increasing
+length, as alternating products of powers of the generators ("syllables"),
+sharing the products of common prefixes. Only one word in each class of
+cyclic rotations is tested, since rotations are conjugate.
+
+A word x is tested for an order divisible by the prime p without computing its
+order: if the order of x is p**a * r with a > 0 and r coprime to p, then r
+divides m, the p'-part of lcm(1, ..., max_order // p), so y = x**m has order
+p**a. Hence p divides the order of x if and only if y is not the identity but
+y**q is, where q is the largest power of p not exceeding max_order (for
+p*p > max_order, q = p and y has order p).
+
+The words of each length are split into tasks by their first syllables, which
+are handed in order to one pool of worker processes. The positions of the first
+tasks that have found a word for each prime are shared by the workers, and a
+task stops as soon as each prime it still looks for has been found by an
+earlier task; the search stops as soon as the first tasks with a word for each
+prime are done. The first word (in the order of enumeration) found for each
+prime is returned, so the result does not depend on the number of processes.
+WITNESS_TABLE lists sets of orders that prove generation.
+"""
+
+import math
+import multiprocessing as mp
+
+from .slp import MM_OPS
+
+
+# For each group, sets of primes such that no maximal subgroup contains elements
+# of all these orders (see other_gens); for 2.B, the maximal subgroups of the
+# quotient B are meant.
+WITNESS_TABLE = {
+    "2.B": [(17, 31)],
+    "Th": [(19, 31)],
+}
+
+
+# The p'-part of lcm(1, ..., max_order // p).
+def _exponent(p, max_order):
+    m = 1
+    for k in range(2, max_order // p + 1):
+        m = m * k // math.gcd(m, k)
+    while m % p == 0:
+        m //= p
+    return m
+
+# A power of x of order p, if p divides the order of x, and None otherwise.
+def power_of_order(x, p, max_order=119):
+    q = p
+    while q * p <= max_order:
+        q *= p
+    y = x**_exponent(p, max_order)
+    if not MM_OPS.is_one(y**q) or MM_OPS.is_one(y):
+        return None
+    z = y**p
+    while not MM_OPS.is_one(z):
+        y, z = z, z**p
+    return y
+
+
+# The syllables: the powers g**e of the generators for 0 < e < n, where n is the
+# order of g, and e <= max_exponent (an integer, or a list with one entry for
+# each generator), as triples (generator index, e, element).
+def _syllables(gens, orders, max_exponent):
+    if isinstance(max_exponent, int):
+        max_exponent = [max_exponent] * len(gens)
+    syllables = []
+    for i, (g, n, m) in enumerate(zip(gens, orders, max_exponent)):
+        for e in range(1, min(n, m + 1)):
+            syllables.append((i, e, g if e == 1 else g**e))
+    return syllables
+
+def _is_canonical(w, syllables):
+    if len(w) > 1 and syllables[w[0]][0] == syllables[w[-1]][0]:
+        return False
+    return all(w <= w[k:] + w[:k] for k in range(1, len(w)))
+
+def _word(w, names, syllables):
+    return "*".join(names[syllables[s][0]] + ("**%d" % syllables[s][1] if syllables[s][1] > 1 else "") for s in w)
+
+
+# The words of the given length starting with one of the prefixes (tuples of
+# syllable indices), in lexicographic order, with their values.
+def _words(prefixes, length, syllables):
+    stack = []
+    for prefix in reversed(prefixes):
+        x = syllables[prefix[0]][2]
+        for s in prefix[1:]:
+            x = x * syllables[s][2]
+        stack.append((prefix, x))
+    while stack:
+        w, x = stack.pop()
+        if len(w) == length:
+            if _is_canonical(w, syllables):
+                yield w, x
+            continue
+        for s in reversed(range(len(syllables))):
+            if syllables[s][0] != syllables[w[-1]][0]:
+                stack.append((w + (s,), x * syllables[s][2]))
+
+
+# The state of a search in a worker process, set by _init: the syllables, and the
+# shared array with the position of the first task (in the list of tasks of the
+# current length) that has found a word for each prime (len(tasks) if none).
+_SYLLABLES = None
+_BEST = None
+
+def _init(gens, orders, max_exponent, best):
+    global _SYLLABLES, _BEST
+    _SYLLABLES = _syllables(gens, orders, max_exponent)
+    _BEST = best
+
+# For each prime in primes, the first word (as a tuple of syllable indices) of
+# the given length starting with prefix, the k-th task, whose order is divisible
+# by that prime; primes already found by an earlier task are skipped.
+def _search(task):
+    k, prefix, length, primes, max_order = task
+    found = {}
+    for w, x in _words([prefix], length, _SYLLABLES):
+        todo = [j for j, p in enumerate(primes) if not p in found and _BEST[j] > k]
+        if not todo:
+            break
+        for j in todo:
+            if power_of_order(x, primes[j], max_order) is not None:
+                found[primes[j]] = w
+                with _BEST.get_lock():
+                    _BEST[j] = min(_BEST[j], k)
+    return found
+
+
+# The prefixes of the words of the given length, in lexicographic order, with
+# as many syllables as needed for at least n_tasks prefixes (but at most length).
+def _prefixes(syllables, length, n_tasks):
+    prefixes = [(s,) for s in range(len(syllables))]
+    while len(prefixes) < n_tasks and len(prefixes[0]) < length:
+        prefixes = [w + (s,) for w in prefixes for s in range(len(syllables))
+                    if syllables[s][0] != syllables[w[-1]][0]]
+    return prefixes
+
+
+# Search for words in the generators gens (mmgroup elements with the given
+# names) whose values have orders divisible by each prime in primes, trying
+# words of up to max_length syllables g**e with 0 < e <= max_exponent (see
+# _syllables).
+# Returns a dictionary mapping each prime found to a pair (word, element) with
+# the word as a string (in the syntax of mtools/words.py) and element a power
+# of its value of order p. The words are searched by a pool of n_processes
+# worker processes.
+def search_words(gens, primes, names=None, max_length=12, max_exponent=2, n_processes=1, max_order=119):
+    names = ["g%d" % i for i in range(len(gens))] if names is None else names
+    orders = [g.order() for g in gens]
+    syllables = _syllables(gens, orders, max_exponent)
+    primes = list(primes)
+    best = mp.Array("i", len(primes))
+    result = {}
+    if n_processes == 1:
+        _init(gens, orders, max_exponent, best)
+        pool, imap = None, map
+    else:
+        pool = mp.Pool(n_processes, _init, (gens, orders, max_exponent, best))
+        imap = pool.imap
+    try:
+        for length in range(1, max_length + 1):
+            todo = [p for p in primes if not p in result]
+            if not todo:
+                break
+            prefixes = _prefixes(syllables, length, 1 if n_processes == 1 else 16 * n_processes)
+            best[:] = [len(prefixes) if p in todo else -1 for p in primes]
+            tasks = [(k, prefix, length, primes, max_order) for k, prefix in enumerate(prefixes)]
+            # the results of the tasks arrive in order, so the first word found for
+            # a prime is the first one in the order of enumeration
+            for found in imap(_search, tasks):
+                for p, w in found.items():
+                    if not p in result:
+                        x = syllables[w[0]][2]
+                        for s in w[1:]:
+                            x = x * syllables[s][2]
+                        result[p] = (_word(w, names, syllables), power_of_order(x, p, max_order))
+                if all(p in result for p in todo):
+                    break
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return result
+
+
+# Search (as in search_words) for words proving that gens generate the group
+# with the given name, i.e. words whose orders are divisible by all primes of
+# one of the sets in WITNESS_TABLE[name]. Returns the dictionary of the words
+# found for that set, or None if no set is completed within max_length.
+def find_generation_witnesses(gens, name, names=None, max_length=12, max_exponent=2, n_processes=1):
+    for primes in WITNESS_TABLE[name]:
+        found = search_words(gens, primes, names, max_length, max_exponent, n_processes)
+        if len(found) == len(primes):
+            return found
+    return None
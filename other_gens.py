@@ -30,9 +30,8 @@ from mmgroup import *
 # In[2]:
 
 
-# Group commutator
-def Comm(a,b):
-   return a**(-1)*b**(-1)*a*b
+# Group commutator (see mtools/helpers.py)
+from mtools.helpers import Comm
 
 
 # ## Generators for $2.\mathbf{B} < \mathbf{M}$
@@ -60,7 +59,9 @@ y.conjugate_involution()
 
 a = MM("M<y_0bdh*x_133h*d_0b03h*p_122433352*l_1*p_71005440*l_2*p_220471680*l_2*t_2*l_2*p_60360960*l_1*p_232890288*l_2*t_1*l_2*p_59473920*l_2*p_241760688*l_1*t_1*l_1*p_13326720*l_2>")
 b = MM("M<y_480h*x_15a9h*d_800h*p_55059691*l_1*p_71005440*l_1*p_199182768*t_1*l_1*p_59917440*l_1*p_242647728*l_1*t_1*l_1*p_49716480*l_1*p_240430080*l_1*t_1*l_2*p_15987840*l_2*t_1*l_2*p_141081600>")
-Comm(y,a) == Comm(y,b) == MM("M<1>")
+from mtools.commuting import all_commute
+
+all_commute([y], [a,b])
 
 
 # We claim that $a$ and $b$ are "standard generators" for $C_\mathbf{M}(y) \cong 2.\mathbf{B}$. This means that $a$ and $b$ generate $C_\mathbf{M}(y)$ and satisfy the following properties:
@@ -78,6 +79,32 @@ Comm(y,a) == Comm(y,b) == MM("M<1>")
 ((a*b*a*b*a*b*a*b**2*a*b*a*b**2*a*b*a*b)**2).order(), (a*b*a*b*a*b*a*b**2*a*b*a*b**2).order()
 
 
+# Before such witness words are found, a first (probabilistic) answer can be obtained from the orders of random elements of $\langle a,b \rangle$ (see mtools/recognition.py). The function recognise draws product-replacement samples (optionally in n_processes worker processes) and compares the histogram of their orders with stored order statistics of the groups $\mathbf{M}$, $2.\mathbf{B}$, $3.\text{Fi}_{24}$, $\text{Th}$ and $\text{PSL}_2(29){:}2$. A candidate is excluded if a sampled order does not divide its order (the sampled element is kept as a witness), and the remaining candidates are ranked by likelihood. Sampled elements of given orders (e.g. $17$ and $31$, as above) are returned by rec.elements_of_order([17, 31]).
+# 
+# ***This is not a proof; it takes 10-20 seconds.***
+
+# In[ ]:
+
+
+from mtools.recognition import recognise
+
+rec = recognise([a,b], 40)
+rec.best(), rec.ranking, {name: g.order() for name, g in rec.witnesses.items()}
+
+
+# Words such as the ones above can be found with the function find_generation_witnesses from mtools/wordsearch.py. It enumerates words in $a$ and $b$ (here products of the syllables $a$, $b$ and $b^2$) by increasing length, sharing the products of common prefixes and testing one word of each class of cyclic rotations, until it has found words whose orders are divisible by all primes of an entry of a table of orders that no maximal subgroup contains together (here $17$ and $31$). Divisibility by a prime $p$ is tested with two powers of each word, without computing its order. The optional argument n_processes distributes the words over a pool of worker processes, in tasks of words with a common prefix, which stop as soon as earlier tasks have found words for their primes; the words found do not depend on the number of processes. Each entry of the result is the word together with a power of it of order $p$.
+# 
+# ***This takes about 15 seconds.***
+
+# In[ ]:
+
+
+from mtools.wordsearch import find_generation_witnesses
+
+witnesses = find_generation_witnesses([a,b], "2.B", names=["a","b"], max_length=14, max_exponent=[1,2])
+{p: (w, x.order()) for p, (w, x) in witnesses.items()}
+
+
 # It now remains to show that $a$ and $b$ satisfy conditions 1-4. 
 # 
 # Consider the following elements of $\mathbf{M}$, which have order $104$ and $78$, respectively, and centralise $y$.
@@ -87,7 +114,7 @@ Comm(y,a) == Comm(y,b) == MM("M<1>")
 
 g104 = MM("M<y_9dh*x_10cbh*d_0ab9h*p_185877467*l_2*p_50603520*l_1*p_210270720*l_1*t_2*l_2*p_70561920*l_2*p_181885440*l_2*t_1*l_2*p_69231360*l_2*p_168579888*l_1*t_2*l_1*p_4012800*l_1*t_1*l_2*p_119792640>")
 g78 = MM("M<y_163h*x_1489h*d_0a93h*p_107838533*l_2*p_70118400*l_2*p_12439680*t_1*l_1*p_45281280*l_2*p_71871360*l_1*t_2*l_1*p_71005440*l_2*p_179667888*l_1*t_2*l_2*p_60804480*l_1*p_152169888>")
-g104.order() == 104 and g78.order() == 78 and Comm(y,g104) == Comm(y,g78) == MM("M<1>")
+g104.order() == 104 and g78.order() == 78 and all_commute([y], [g104,g78])
 
 
 # Now observe that $g_{104}^{26}=a$ and $g_{78}^{13}=b$. In particular, $|a|=4$ and $|b|=6$.
@@ -122,6 +149,45 @@ g104**26 == a and g78**13 == b and a.order() == 4 and b.order() == 6
 ((a*b)**3*(a*b**2)*(a*b)*(a*b**2)**2)**23 in [y, y**2]
 
 
+# The same expression can be built from lazy elements (see mtools/lazy.py), which record the expression and compute it only when its value is needed. The two occurrences of $ab$ (and of $b^2$) are then the same node, whose value is computed and reduced once, and the products are concatenated as words without intermediate reductions.
+
+# In[ ]:
+
+
+from mtools.lazy import lazy
+
+A, B = lazy(a), lazy(b)
+x23 = ((A*B)**3*(A*B**2)*(A*B)*(A*B**2)**2)**23
+x23.value() in [y, y**2]
+
+
+# The words in $a$ and $b$ used above can also be evaluated in one batch (see mtools/words.py). The words are stored in a prefix trie, so that each common prefix, and each power of $a$, $b$ or of a parenthesised subword, is computed only once.
+
+# In[ ]:
+
+
+from mtools.words import WordEvaluator
+
+ev = WordEvaluator({"a": a, "b": b})
+w17, w31, w55, w23 = ev.evaluate(["(a*b*a*b*a*b*a*b**2*a*b*a*b**2*a*b*a*b)**2", "a*b*a*b*a*b*a*b**2*a*b*a*b**2", "a*b", "((a*b)**3*(a*b**2)*(a*b)*(a*b**2)**2)**23"])
+w17.order() == 17 and w31.order() == 31 and w55.order() == 55 and w23 in [y, y**2]
+
+
+# The checks of this section can also be stated declaratively, as a specification of standard generators (see mtools/stdgens.py): the elements involved, and a list of conditions on words in these elements. The specifications of all sections are verified together at the end of this notebook.
+
+# In[ ]:
+
+
+from mtools.stdgens import GeneratorSpec, verify_specs
+
+spec_2B = GeneratorSpec("2.B", {"y": y, "a": a, "b": b, "g104": g104, "g78": g78}, [
+    ("involution_class", "y", 1), ("commute", "y", "a"), ("commute", "y", "b"),
+    ("order", "(a*b*a*b*a*b*a*b**2*a*b*a*b**2*a*b*a*b)**2", 17), ("order", "a*b*a*b*a*b*a*b**2*a*b*a*b**2", 31),
+    ("order", "g104", 104), ("order", "g78", 78), ("commute", "y", "g104"), ("commute", "y", "g78"),
+    ("power", "g104", 26, "a"), ("power", "g78", 13, "b"), ("order", "a", 4), ("order", "b", 6),
+    ("order", "a*b", 55), ("power_in", "(a*b)**3*(a*b**2)*(a*b)*(a*b**2)**2", 23, ["y", "y**2"])])
+
+
 # ## Generators for $\text{S}_3 \times \text{Th} < \mathbf{M}$
 # 
 # The maximal subgroup $\text{S}_3 \times \text{Th}$ of $\mathbf{M}$ is the normaliser of an element of class $3\text{C}$. Our copy of this subgroup is generated by the following four elements; the element $c_3$ is the $3\text{C}$-element being normalised. 
@@ -149,7 +215,7 @@ c2.order() == 2 and c3.order() == 3 and c3**c2 == c3**-1
 # In[13]:
 
 
-Comm(c2,a) == Comm(c2,b) == Comm(c3,a) == Comm(c3,b) == MM("M<1>")
+all_commute([c2,c3], [a,b])
 
 
 # The element $a$ is of class $2B$, so we conjugate $c_3$ into mmgroup's copy of the $2\text{B}$-centraliser $2^{1+24}.\text{Co}_1$ and confirm that $c_3 \in 3\text{C}$. 
@@ -198,6 +264,20 @@ Comm(g39,c2) == Comm(g39,c2) == MM("M<1>") and g39.order() == 39 and g39**13 ==
 (a*b*a*b**2*a*b**2*a*b*a*b**2*a*b*a*b*a*b*a*b**2*a*b**2*a*b*a*b).order()
 
 
+# The specification of standard generators for $\text{Th}$, together with $c_2$ and $c_3$.
+
+# In[ ]:
+
+
+spec_Th = GeneratorSpec("S3 x Th", {"a": a, "b": b, "c2": c2, "c3": c3, "g39": g39}, [
+    ("order", "c2", 2), ("order", "c3", 3), ("inverts", "c2", "c3"),
+    ("commute", "c2", "a"), ("commute", "c2", "b"), ("commute", "c3", "a"), ("commute", "c3", "b"),
+    ("involution_class", "a", 2), ("chi", "c3", -1, "a"),
+    ("order", "a", 2), ("order", "a*b", 19),
+    ("commute", "g39", "c2"), ("commute", "g39", "c3"), ("order", "g39", 39), ("power", "g39", 13, "b"),
+    ("order", "a*b*a*b**2*a*b**2*a*b*a*b**2*a*b*a*b*a*b*a*b**2*a*b**2*a*b*a*b", 31)])
+
+
 # ## Generators for $3.\text{Fi}_{24} < \mathbf{M}$
 # 
 # The maximal subgroup $3.\text{Fi}_{24}$ of $\mathbf{M}$ is the normaliser of an element of class $3\text{A}$. Our copy of this subgroup is the normaliser of the following element. 
@@ -260,6 +340,19 @@ g40 = MM("M<y_57fh*x_1d3h*d_603h*p_39537390*l_2*p_2344320*l_2*p_53820870*t_2*l_1
 g3**g46 == g3**g40 == g3**-1 and g46.order() == 46 and g40.order() == 40 and g46**23 == a and g40**5 == b
 
 
+# The specification of standard generators for $3.\text{Fi}_{24}$ (including condition 3, checked below).
+
+# In[ ]:
+
+
+spec_Fi24 = GeneratorSpec("3.Fi24", {"g3": g3, "a": a, "b": b, "g46": g46, "g40": g40}, [
+    ("order", "g3", 3), ("chi", "g3", 782),
+    ("inverts", "a", "g3"), ("inverts", "b", "g3"), ("not_in", "a", ["g3", "g3**2", "g3**3"]), ("not_in", "b", ["g3", "g3**2", "g3**3"]),
+    ("order", "a", 2), ("order", "b", 8),
+    ("inverts", "g46", "g3"), ("inverts", "g40", "g3"), ("order", "g46", 46), ("order", "g40", 40),
+    ("power", "g46", 23, "a"), ("power", "g40", 5, "b"), ("order", "a*b", 29)])
+
+
 # Finally, condition 3 also holds.
 
 # In[25]:
@@ -287,12 +380,23 @@ b = MM("M<y_0a7h*x_51fh*d_0d58h*p_43929380*l_2*p_2344320*l_2*p_11172722*t_2*l_1*
 # 
 # $\langle a,b \mid a^2 = b^{29} = (ab^2)^4 = (abab^2)^3 = 1 \rangle$.
 # 
-# Our elements $a$ and $b$ satisfy this presentation.
+# Our elements $a$ and $b$ satisfy this presentation (which we check with the class Presentation from mtools/presentations.py).
 
 # In[27]:
 
 
-a**2 == b**29 == (a*b**2)**4 == (a*b*a*b**2)**3 == MM("M<1>")
+from mtools.presentations import Presentation
+
+PSL2_29_2 = Presentation(["a", "b"], ["a**2", "b**29", "(a*b**2)**4", "(a*b*a*b**2)**3"])
+PSL2_29_2.verify([a, b])
+
+
+# Coset enumeration over the trivial subgroup (see mtools/cosets.py) confirms that this presentation defines a group of order $24360 = |\text{PSL}_2(29){:}2|$.
+
+# In[ ]:
+
+
+PSL2_29_2.order()
 
 
 # It follows from Von Dyck's Theorem that $\langle a,b \rangle \cong \text{PSL}_2(29){:}2$ or $\text{PSL}_2(29)$. The latter group has no elements of order $28$, so to show that $\langle a,b \rangle \cong \text{PSL}_2(29){:}2$ it now suffices to exhibit an element of order $28$ in $\langle a,b \rangle$.
@@ -333,3 +437,36 @@ g28.order() == 28 and ci_g28[0] == 2 and (g28**ci_g28[1]).in_G_x0() and (g28**ci
 g30 = a*b**2*Comm(a,a*b**2)**7
 g30.order() == 30 and g30.in_G_x0() and g30.chi_G_x0()[0] == 0
 
+
+# The specification for $\text{PSL}_2(29){:}2$, including the elements of order $28$ and $30$ used for the class fusion.
+
+# In[ ]:
+
+
+spec_L229 = GeneratorSpec("PSL2(29):2", {"a": a, "b": b}, [
+    ("presentation", ["a**2", "b**29", "(a*b**2)**4", "(a*b*a*b**2)**3"]), ("order", "a*b", 28),
+    ("involution_class", "(a*b)**14", 2), ("chi", "a*b", 1, "(a*b)**14"),
+    ("order", "a*b**2*Comm(a,a*b**2)**7", 30), ("chi", "a*b**2*Comm(a,a*b**2)**7", 0)])
+
+
+# ## Batch verification
+# 
+# Verify the specifications of all sections at once, with one worker process for each specification, so that the total time is roughly that of the slowest specification. The results (for each specification and each check) are also written to the file other_gens_report.json.
+# 
+# The results of the checks are also kept in a ClaimStore (see mtools/claims.py) in the file other_gens_claims.json, keyed by a hash of the elements each check refers to and of the code of the check. When the notebook is run again, only the checks whose elements or code have changed are evaluated; the others are reused from the store. The last cell lists the numbers of reused and recomputed checks.
+
+# In[ ]:
+
+
+from mtools.claims import ClaimStore
+
+store = ClaimStore("other_gens_claims.json")
+results = verify_specs([spec_2B, spec_Th, spec_Fi24, spec_L229], n_processes=4, report="other_gens_report.json", store=store)
+[(r["name"], r["passed"]) for r in results]
+
+
+# In[ ]:
+
+
+{k: len(v) for k, v in store.report().items()}
+